@@ -0,0 +1,164 @@
+"""
+Degree-distribution analytics over the degrees graph.
+
+Runs one breadth-first traversal per source person across a process
+pool and returns, for each source, how many people sit at each
+degree of separation. From those level counts follow "people within
+k degrees", eccentricity and the separation histogram.
+
+Usage: python analytics.py directory [sources] [processes] [seed]
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+
+import degrees
+
+# Integer graph used by the traversal, shared read-only by workers
+graph = None
+
+
+def load_graph(directory):
+    """
+    Returns the integer graph for a directory: the memory-mapped
+    snapshot when there is one, else an in-memory costars.Graph.
+    """
+    global graph
+    if graph is None:
+        degrees.load_data(directory)
+        graph = degrees.integer_graph()
+    return graph
+
+
+def level_counts(graph, source, max_depth=None):
+    """
+    Returns a list whose k-th item is the number of people exactly
+    k degrees from `source` (the 0-th item is the source itself).
+
+    Visited people and movies are bit-packed into bytearrays, and a
+    movie is expanded only the first time it is reached, since all
+    of its stars land on the same level.
+    """
+    seenPeople = bytearray((graph.person_count + 7) >> 3)
+    seenMovies = bytearray((graph.movie_count + 7) >> 3)
+    seenPeople[source >> 3] |= 1 << (source & 7)
+
+    counts = [1]
+    frontier = [source]
+    while frontier and (max_depth is None or len(counts) <= max_depth):
+        nextFrontier = []
+        for person in frontier:
+            for movie in graph.movies_of(person):
+                if seenMovies[movie >> 3] & (1 << (movie & 7)):
+                    continue
+                seenMovies[movie >> 3] |= 1 << (movie & 7)
+                for star in graph.stars_of(movie):
+                    if seenPeople[star >> 3] & (1 << (star & 7)):
+                        continue
+                    seenPeople[star >> 3] |= 1 << (star & 7)
+                    nextFrontier.append(star)
+        if nextFrontier:
+            counts.append(len(nextFrontier))
+        frontier = nextFrontier
+    return counts
+
+
+def within(counts, k):
+    """
+    Returns how many other people are within `k` degrees.
+    """
+    return sum(counts[1:k + 1])
+
+
+def eccentricity(counts):
+    """
+    Returns the largest degree of separation from the source
+    to anyone reachable.
+    """
+    return len(counts) - 1
+
+
+def histogram(results):
+    """
+    Sums per-source level counts into one histogram of degrees of
+    separation over all reachable (source, person) pairs.
+    """
+    total = []
+    for counts in results.values():
+        for k, count in enumerate(counts):
+            if k == 0:
+                continue
+            while len(total) <= k:
+                total.append(0)
+            total[k] += count
+    return total
+
+
+def init_worker(directory):
+    load_graph(directory)
+
+
+def worker_counts(task):
+    source, max_depth = task
+    return source, level_counts(graph, source, max_depth)
+
+
+def sweep(directory, person_ids, processes=None, max_depth=None):
+    """
+    Returns {person_id: level counts} for every distinct person in
+    `person_ids`, traversing from each of them in parallel.
+
+    The graph is loaded before the pool starts and workers are forked
+    where the platform allows, so they share it instead of loading
+    it again; workers started another way load (or map) it themselves.
+    """
+    g = load_graph(directory)
+    sources = [g.person_index(person_id) for person_id in dict.fromkeys(person_ids)]
+    tasks = [(source, max_depth) for source in sources if source is not None]
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+    with context.Pool(processes, initializer=init_worker, initargs=(directory,)) as pool:
+        return {g.person_id(source): counts
+                for source, counts in pool.imap_unordered(worker_counts, tasks)}
+
+
+def main():
+    if len(sys.argv) not in range(2, 6):
+        sys.exit("Usage: python analytics.py directory [sources] [processes] [seed]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+
+    print("Loading data...")
+    g = load_graph(directory)
+    print("Data loaded.")
+
+    rng = random.Random(seed)
+    sources = rng.sample(range(g.person_count), min(count, g.person_count))
+    person_ids = [g.person_id(source) for source in sources]
+
+    start = time.perf_counter()
+    results = sweep(directory, person_ids, processes)
+    seconds = time.perf_counter() - start
+    print(f"{len(results)} sources in {seconds:.2f}s "
+          f"({len(results) / seconds:.1f} sources/s)")
+
+    print(f"{'degrees':>8}{'pairs':>14}")
+    for k, pairs in enumerate(histogram(results)):
+        if k > 0:
+            print(f"{k:>8}{pairs:>14}")
+
+    reach = [within(counts, eccentricity(counts)) for counts in results.values()]
+    eccentricities = [eccentricity(counts) for counts in results.values()]
+    print(f"Mean reachable people: {sum(reach) / len(reach):.1f}")
+    print(f"Mean eccentricity: {sum(eccentricities) / len(eccentricities):.2f}, "
+          f"max: {max(eccentricities)}")
+
+
+if __name__ == "__main__":
+    main()
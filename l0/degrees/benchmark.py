@@ -0,0 +1,75 @@
+"""
+Compares the degrees search modes over a fixed set of random pairs.
+
+Usage: python benchmark.py directory [pairs] [seed]
+"""
+
+import random
+import sys
+import time
+
+import degrees
+from util import SearchStats
+
+MODES = ["bfs", "bidirectional", "astar"]
+
+
+def random_pairs(count, seed):
+    """
+    Returns `count` (source, target) person_id pairs drawn with a
+    fixed seed, so every run measures the same queries.
+    """
+    person_ids = sorted(degrees.people)
+    rng = random.Random(seed)
+    return [(rng.choice(person_ids), rng.choice(person_ids)) for _ in range(count)]
+
+
+def run(mode, pairs):
+    """
+    Runs every pair with `mode`. Returns (path lengths, stats, seconds).
+    """
+    lengths = []
+    stats = []
+    seconds = []
+    for source, target in pairs:
+        counters = SearchStats()
+        start = time.perf_counter()
+        path = degrees.shortest_path(source, target, mode=mode, stats=counters)
+        seconds.append(time.perf_counter() - start)
+        stats.append(counters)
+        lengths.append(None if path is None else len(path))
+    return lengths, stats, seconds
+
+
+def main():
+    if len(sys.argv) not in (2, 3, 4):
+        sys.exit("Usage: python benchmark.py directory [pairs] [seed]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    degrees.load_data(directory)
+    degrees.build_landmark_index(directory)
+    pairs = random_pairs(count, seed)
+
+    results = {mode: run(mode, pairs) for mode in MODES}
+    reference = results[MODES[0]][0]
+    for mode in MODES[1:]:
+        if results[mode][0] != reference:
+            sys.exit(f"{mode} returned different path lengths than {MODES[0]}")
+
+    print(f"{count} pairs, seed {seed}")
+    print(f"{'mode':<15}{'expanded':>10}{'enqueued':>10}{'dupes':>10}"
+          f"{'peak':>10}{'mean ms':>10}{'max ms':>10}")
+    for mode in MODES:
+        _, stats, seconds = results[mode]
+        print(f"{mode:<15}"
+              f"{sum(s.expanded for s in stats) / count:>10.1f}"
+              f"{sum(s.enqueued for s in stats) / count:>10.1f}"
+              f"{sum(s.duplicates for s in stats) / count:>10.1f}"
+              f"{max(s.peak_frontier for s in stats):>10}"
+              f"{1000 * sum(seconds) / count:>10.3f}{1000 * max(seconds):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Precomputed co-star adjacency for the degrees search.
+
+Each person index maps to one flat array of interleaved
+(movie, co-star) integer pairs, so a search can iterate a person's
+neighbours without building a set of string tuples per call.
+
+Usage: python costars.py directory [pairs] [cache_size]
+prints a memory/speed report for the eager and the lazy index.
+"""
+
+import sys
+import time
+import tracemalloc
+from array import array
+from functools import lru_cache
+
+from snapshot import INDEX, csr
+
+
+class Graph():
+    """
+    In-memory integer graph built from the `people` / `movies` dicts,
+    with the same index-based interface as snapshot.Snapshot.
+    """
+
+    def __init__(self, people, movies):
+        self.person_ids = list(people)
+        self.movie_ids = list(movies)
+        self.person_indices = {person_id: i for i, person_id in enumerate(self.person_ids)}
+        self.movie_indices = {movie_id: i for i, movie_id in enumerate(self.movie_ids)}
+        self.person_count = len(self.person_ids)
+        self.movie_count = len(self.movie_ids)
+
+        stars = []
+        for i, person_id in enumerate(self.person_ids):
+            for movie_id in people[person_id]["movies"]:
+                stars.append((i, self.movie_indices[movie_id]))
+        self.person_movie_offsets, self.person_movies = csr(self.person_count, stars)
+        self.movie_star_offsets, self.movie_stars = csr(
+            self.movie_count, [(m, p) for p, m in stars])
+
+    def person_id(self, person):
+        return self.person_ids[person]
+
+    def movie_id(self, movie):
+        return self.movie_ids[movie]
+
+    def person_index(self, person_id):
+        return self.person_indices.get(person_id)
+
+    def movie_index(self, movie_id):
+        return self.movie_indices.get(movie_id)
+
+    def movies_of(self, person):
+        offsets = self.person_movie_offsets
+        return self.person_movies[offsets[person]:offsets[person + 1]]
+
+    def stars_of(self, movie):
+        offsets = self.movie_star_offsets
+        return self.movie_stars[offsets[movie]:offsets[movie + 1]]
+
+
+class CostarIndex():
+    """
+    Maps a person index to an array of interleaved (movie, co-star)
+    pairs. With `cache_size=None` every person is built up front;
+    otherwise entries are built on first use and kept in an LRU cache
+    of `cache_size` people.
+    """
+
+    def __init__(self, graph, cache_size=None):
+        self.graph = graph
+        self.cache_size = cache_size
+        if cache_size is None:
+            self.table = [self.build(person) for person in range(graph.person_count)]
+            self.pairs = self.table.__getitem__
+        else:
+            self.table = None
+            self.pairs = lru_cache(maxsize=cache_size)(self.build)
+
+    def build(self, person):
+        """
+        Returns the (movie, co-star) pairs of a person, excluding
+        the person themselves.
+        """
+        pairs = array(INDEX)
+        for movie in self.graph.movies_of(person):
+            for star in self.graph.stars_of(movie):
+                if star != person:
+                    pairs.append(movie)
+                    pairs.append(star)
+        return pairs
+
+    def neighbors(self, person):
+        """
+        Returns an iterator of (movie, co-star) index pairs.
+        """
+        pairs = iter(self.pairs(person))
+        return zip(pairs, pairs)
+
+    def person_index(self, person_id):
+        return self.graph.person_index(person_id)
+
+    def path_ids(self, path):
+        """
+        Converts a path of index pairs to (movie_id, person_id) pairs.
+        """
+        if path is None:
+            return None
+        return [(self.graph.movie_id(movie), self.graph.person_id(person))
+                for movie, person in path]
+
+
+def measure(build):
+    """
+    Returns (result, seconds, peak bytes allocated) of calling `build`.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    if len(sys.argv) not in (2, 3, 4):
+        sys.exit("Usage: python costars.py directory [pairs] [cache_size]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    cache_size = int(sys.argv[3]) if len(sys.argv) > 3 else 4096
+
+    import benchmark
+    import degrees
+
+    degrees.load_data(directory)
+    pairs = benchmark.random_pairs(count, 50)
+
+    print(f"{count} pairs")
+    print(f"{'index':<16}{'build s':>10}{'build MB':>10}"
+          f"{'bfs ms':>10}{'bidir ms':>10}{'query MB':>10}")
+    reference = None
+    for label, cache in (("none", False), ("eager", None), (f"lru({cache_size})", cache_size)):
+        degrees.costar_index = None
+        build_seconds = build_peak = 0
+        if cache is not False:
+            _, build_seconds, build_peak = measure(
+                lambda: degrees.build_costar_index(cache_size=cache))
+        row = f"{label:<16}{build_seconds:>10.3f}{build_peak / 2 ** 20:>10.2f}"
+        query_peak = 0
+        for mode in ("bfs", "bidirectional"):
+            lengths, _, seconds = benchmark.run(mode, pairs)
+            reference = reference or lengths
+            if lengths != reference:
+                sys.exit(f"{label} {mode} returned different path lengths")
+            row += f"{1000 * sum(seconds) / count:>10.3f}"
+            # Second, traced pass: tracing skews timings
+            _, _, peak = measure(lambda: benchmark.run(mode, pairs))
+            query_peak = max(query_peak, peak)
+        print(row + f"{query_peak / 2 ** 20:>10.2f}")
+    degrees.costar_index = None
+
+
+if __name__ == "__main__":
+    main()
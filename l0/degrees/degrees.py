@@ -1,7 +1,13 @@
 import csv
+import heapq
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+import costars
+import ingest
+import landmarks
+import nameindex
+import snapshot
+from util import StackFrontier, QueueFrontier, SearchStats
 from collections import deque
 from typing import Deque
 
@@ -14,11 +20,43 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Integer-indexed graph: the memory-mapped snapshot.Snapshot when
+# loaded from one, else a costars.Graph built on first use
+graph = None
 
-def load_data(directory):
+# Optional costars.CostarIndex used by shortest_path; built lazily
+# over the snapshot when one is loaded
+costar_index = None
+
+# LRU size of the co-star index built over a loaded snapshot
+SNAPSHOT_CACHE_SIZE = 65536
+
+# Optional landmarks.LandmarkIndex used by separation_bounds and A*
+landmark_index = None
+
+# Optional nameindex.NameIndex used to suggest names in person_id_for_name
+name_index = None
+
+# Extra degrees beyond the shortest that k_shortest_paths considers
+# when not asked for a number of paths
+MAX_EXTRA_DEGREES = 2
+
+
+def load_data(directory, stream=False):
     """
     Load data from CSV files into memory.
+
+    If the directory has an up-to-date compiled snapshot
+    (see snapshot.py), it is memory-mapped instead. With `stream`,
+    the CSVs are read by ingest.py into compact records.
     """
+    if snapshot.is_fresh(directory):
+        load_snapshot(directory)
+        return
+    if stream:
+        ingest.load(directory, names, people, movies)
+        return
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -54,6 +92,75 @@ def load_data(directory):
                 pass
 
 
+def load_snapshot(directory):
+    """
+    Memory-map the compiled snapshot of a directory and expose it
+    through `names`, `people` and `movies`. Searches run on its
+    integer arrays through a lazy co-star index; the views are only
+    for looking up names and titles.
+    """
+    global names, people, movies, graph, costar_index
+    graph = snapshot.Snapshot(snapshot.snapshot_path(directory))
+    names = snapshot.NamesView(graph)
+    people = snapshot.PeopleView(graph)
+    movies = snapshot.MoviesView(graph)
+    costar_index = costars.CostarIndex(graph, SNAPSHOT_CACHE_SIZE)
+
+
+def integer_graph():
+    """
+    Returns the integer-indexed graph of the loaded data.
+    """
+    global graph
+    if graph is None:
+        graph = costars.Graph(people, movies)
+    return graph
+
+
+def build_costar_index(cache_size=None):
+    """
+    Build the co-star index used by shortest_path. With a
+    `cache_size`, entries are built lazily and LRU-bounded.
+    """
+    global costar_index
+    costar_index = costars.CostarIndex(integer_graph(), cache_size)
+    return costar_index
+
+
+def build_landmark_index(directory, k=landmarks.LANDMARKS):
+    """
+    Load, update or build the landmark index of a data directory,
+    enabling separation_bounds and mode="astar".
+    """
+    global landmark_index
+    landmark_index = landmarks.load_or_build(directory, integer_graph(), k)
+    return landmark_index
+
+
+def build_name_index():
+    """
+    Build the prefix / typo-tolerant index over `names`.
+    """
+    global name_index
+    name_index = nameindex.NameIndex(names)
+    return name_index
+
+
+def separation_bounds(source, target):
+    """
+    Returns (lower, upper) bounds on the degrees of separation
+    between two person_ids, from the landmark index.
+    (None, None) means they are not connected.
+    """
+    s = landmark_index.person_index(source)
+    t = landmark_index.person_index(target)
+    if s is None or t is None:
+        return None, None
+    if s == t:
+        return 0, 0
+    return landmark_index.bounds(s, t)
+
+
 def main():
     if len(sys.argv) > 2:
         sys.exit("Usage: python degrees.py [directory]")
@@ -63,6 +170,7 @@ def main():
     # Load data from files into memory
     print("Loading data...")
     load_data(directory)
+    build_name_index()
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -87,52 +195,396 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, mode="bfs", stats=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
+    `mode` selects the search: "bfs", "bidirectional" or "astar"
+    (landmark-guided, needs build_landmark_index).
+    If `stats` is a util.SearchStats, the search adds its counters.
+    When a co-star index is built, the search runs over its
+    integer pairs instead of neighbors_for_person.
+
     If no possible path, returns None.
     """
+    if mode not in SEARCHES:
+        raise ValueError(f"unknown search mode: {mode}")
+    if stats is None:
+        stats = SearchStats()
+    search = SEARCHES[mode]
+    if costar_index is None:
+        return search(source, target, neighbors_for_person, stats)
+
+    source = costar_index.person_index(source)
+    target = costar_index.person_index(target)
+    if source is None or target is None:
+        return None
+    return costar_index.path_ids(search(source, target, costar_index.neighbors, stats))
+
+
+def bfs_path(source, target, neighbors, stats):
+    """
+    Breadth-first search from source to target, using `neighbors`
+    to list (movie, person) pairs of a person.
+
+    People are marked visited when enqueued, by recording their
+    parent, so nobody is queued twice.
+    """
     if source == target:
         return []
 
-    frontier = deque() # of type Node
-    visitedStars = set()
+    # person -> (movie_id, previous person)
+    parents = {source: None}
+    frontier = deque([source])
+    while frontier:
+        person = frontier.popleft()
+        stats.expanded += 1
+        for movie_id, neighbor in neighbors(person):
+            if neighbor in parents:
+                stats.duplicates += 1
+                continue
+            parents[neighbor] = (movie_id, person)
+            if neighbor == target:
+                return trace_path(parents, target)
+            frontier.append(neighbor)
+            stats.enqueued += 1
+        stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+    return None
 
-    # init frontier
-    visitedStars.add(source)
-    for curr_neighbor in neighbors_for_person(source):
-        if curr_neighbor[1] in visitedStars:
-            continue
-        node = Node(curr_neighbor, None, None)
-        frontier.append(node)
-
-    # traverse
-    while len(frontier) > 0:
-        node: Node = frontier.popleft()
-        curr_neighbor = node.state # movie-person pair
-        person = curr_neighbor[1]
+
+def bidirectional_path(source, target, neighbors, stats):
+    """
+    Bidirectional BFS: grows one frontier from the source and one from
+    the target, always expanding a whole level of the smaller one,
+    and joins them at the first person reached from both sides.
+
+    Returns the same path format as `shortest_path`.
+    """
+    if source == target:
+        return []
+
+    # person -> (movie_id, person one step closer to that side's root)
+    forward = {source: None}
+    backward = {target: None}
+    forwardFrontier = [source]
+    backwardFrontier = [target]
+
+    while forwardFrontier and backwardFrontier:
+        if len(forwardFrontier) <= len(backwardFrontier):
+            forwardFrontier, meeting = expand_level(forwardFrontier, forward, backward, neighbors, stats)
+        else:
+            backwardFrontier, meeting = expand_level(backwardFrontier, backward, forward, neighbors, stats)
+        if meeting is not None:
+            return join_paths(meeting, forward, backward)
+    return None
+
+
+def expand_level(frontier, parents, otherParents, neighbors, stats):
+    """
+    Expands every person in `frontier`, recording parents.
+    Returns (next frontier, meeting person or None).
+    """
+    nextFrontier = []
+    for person in frontier:
+        stats.expanded += 1
+        for movie_id, neighbor in neighbors(person):
+            if neighbor in parents:
+                stats.duplicates += 1
+                continue
+            parents[neighbor] = (movie_id, person)
+            if neighbor in otherParents:
+                return nextFrontier, neighbor
+            nextFrontier.append(neighbor)
+            stats.enqueued += 1
+    stats.peak_frontier = max(stats.peak_frontier, len(nextFrontier))
+    return nextFrontier, None
+
+
+def join_paths(meeting, forward, backward):
+    """
+    Builds the (movie_id, person_id) path through `meeting` from the
+    parent maps of a bidirectional search.
+    """
+    path = trace_path(forward, meeting)
+    person = meeting
+    while backward[person] is not None:
+        movie_id, following = backward[person]
+        path.append((movie_id, following))
+        person = following
+    return path
+
+
+def astar_path(source, target, neighbors, stats):
+    """
+    A* search guided by landmark lower bounds, which never overestimate
+    the remaining separation, so the first time the target is popped
+    its path is shortest.
+    """
+    if landmark_index is None:
+        raise ValueError("astar needs build_landmark_index()")
+    if source == target:
+        return []
+
+    if costar_index is not None:
+        index_of = lambda person: person
+    else:
+        index_of = landmark_index.person_index
+    goal = index_of(target)
+    heuristic = landmark_index.lower_bound
+
+    # person -> (movie_id, previous person)
+    parents = {source: None}
+    depth = {source: 0}
+    counter = 0
+    heap = [(heuristic(index_of(source), goal), 0, counter, source)]
+    closed = set()
+    while heap:
+        _, _, _, person = heapq.heappop(heap)
         if person == target:
-            return getPath(node)
-        # add to the frontier if not visited
-        if person in visitedStars:
+            return trace_path(parents, target)
+        if person in closed:
             continue
-        visitedStars.add(person)
-        for newNeighbor in neighbors_for_person(person):  # movie-person pair
-            if newNeighbor[1] in visitedStars:
+        closed.add(person)
+        stats.expanded += 1
+        g = depth[person] + 1
+        for movie_id, neighbor in neighbors(person):
+            if neighbor in closed or depth.get(neighbor, g + 1) <= g:
+                stats.duplicates += 1
                 continue
-            newNode = Node(newNeighbor, node, None)
-            frontier.append(newNode)
+            depth[neighbor] = g
+            parents[neighbor] = (movie_id, person)
+            counter += 1
+            # Prefer deeper nodes among equal f to reach the target sooner
+            heapq.heappush(heap, (g + heuristic(index_of(neighbor), goal), -g, counter, neighbor))
+            stats.enqueued += 1
+        stats.peak_frontier = max(stats.peak_frontier, len(heap))
+    return None
+
+
+SEARCHES = {
+    "bfs": bfs_path,
+    "bidirectional": bidirectional_path,
+    "astar": astar_path,
+}
+
+
+def all_shortest_paths(source, target):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs that
+    connects the source to the target, one at a time.
+    """
+    yield from k_shortest_paths(source, target, extra_degrees=0)
+
+
+def k_shortest_paths(source, target, k=None, extra_degrees=None):
+    """
+    Yields up to `k` simple paths (no person twice) from source to
+    target in order of length, as lists of (movie_id, person_id).
+
+    A bidirectional breadth-first search that keeps every link between
+    consecutive levels finds the shortest length, and the people where
+    its two halves meet. The shortest paths are read off these
+    predecessor DAGs without further search. Only if more paths are
+    wanted is the backward search deepened, one level per length, into
+    distance labels that let a depth-first search from the source
+    enumerate the paths of each longer length L, pruning any step whose
+    label cannot finish within L. Only the current path is held in
+    memory.
+
+    `extra_degrees` is the number of degrees allowed beyond the
+    shortest. By default there is no such limit when `k` is given, so
+    the search goes on until it has `k` paths or no longer simple path
+    can exist, which in a large component may take long if fewer than
+    `k` paths exist; without `k` it is MAX_EXTRA_DEGREES.
+    """
+    if extra_degrees is None and k is None:
+        extra_degrees = MAX_EXTRA_DEGREES
+    if costar_index is None:
+        neighbors = neighbors_for_person
+    else:
+        neighbors = costar_index.neighbors
+        source = costar_index.person_index(source)
+        target = costar_index.person_index(target)
+        if source is None or target is None:
+            return
+    if source == target:
+        yield []
+        return
+
+    dag = shortest_path_dag(source, target, neighbors)
+    if dag is None:
+        return
+    shortest, meeting, forward, backward, distances, frontier = dag
+    count = 0
+    for person in meeting:
+        for head in dag_paths(person, forward):
+            for tail in dag_tails(person, backward):
+                path = head + tail
+                if costar_index is not None:
+                    path = costar_index.path_ids(path)
+                yield path
+                count += 1
+                if count == k:
+                    return
+
+    length = shortest
+    while extra_degrees is None or length < shortest + extra_degrees:
+        length += 1
+        frontier = deepen(distances, frontier, neighbors, length)
+        # Once the target's whole component is labelled, a simple path
+        # has fewer steps than the component has people
+        if not frontier and length >= len(distances):
+            return
+        for path in bounded_paths(source, target, length, neighbors, distances):
+            if costar_index is not None:
+                path = costar_index.path_ids(path)
+            yield path
+            count += 1
+            if count == k:
+                return
+
+
+def shortest_path_dag(source, target, neighbors):
+    """
+    Breadth-first search from both ends a whole level at a time,
+    recording for each person every (movie_id, person) link back to
+    the previous level, until the two sides meet.
+
+    Returns (shortest length, the people where they met, forward
+    links, backward links, {person: degrees to target} of the backward
+    side, its last level), or None if they are not connected.
+    """
+    forwardDepth = {source: 0}
+    backwardDepth = {target: 0}
+    forward = {source: []}
+    backward = {target: []}
+    forwardFrontier = [source]
+    backwardFrontier = [target]
+
+    while forwardFrontier and backwardFrontier:
+        if len(forwardFrontier) <= len(backwardFrontier):
+            forwardFrontier, meeting = expand_links(
+                forwardFrontier, forwardDepth, forward, backwardDepth, neighbors)
+        else:
+            backwardFrontier, meeting = expand_links(
+                backwardFrontier, backwardDepth, backward, forwardDepth, neighbors)
+        if meeting:
+            shortest = min(forwardDepth[person] + backwardDepth[person] for person in meeting)
+            meeting = [person for person in meeting
+                       if forwardDepth[person] + backwardDepth[person] == shortest]
+            return shortest, meeting, forward, backward, backwardDepth, backwardFrontier
     return None
 
-def getPath(endNode: Node) -> list: # list of movie-person pairs
+
+def expand_links(frontier, depths, links, otherDepths, neighbors):
+    """
+    Expands a whole level, linking each person of the next level to
+    every person of `frontier` they are reached from.
+    Returns (next frontier, people of it the other side has reached).
+    """
+    depth = depths[frontier[0]] + 1
+    nextFrontier = []
+    meeting = []
+    for person in frontier:
+        for movie_id, neighbor in neighbors(person):
+            known = depths.get(neighbor)
+            if known is None:
+                depths[neighbor] = depth
+                links[neighbor] = [(movie_id, person)]
+                nextFrontier.append(neighbor)
+                if neighbor in otherDepths:
+                    meeting.append(neighbor)
+            elif known == depth:
+                links[neighbor].append((movie_id, person))
+    return nextFrontier, meeting
+
+
+def dag_paths(person, links):
+    """
+    Yields every path from the root of `links` to `person`, following
+    the links backwards.
+    """
+    if not links[person]:
+        yield []
+        return
+    for movie_id, previous in links[person]:
+        for path in dag_paths(previous, links):
+            yield path + [(movie_id, person)]
+
+
+def dag_tails(person, links):
+    """
+    Yields every path from `person` to the root of `links`.
+    """
+    if not links[person]:
+        yield []
+        return
+    for movie_id, following in links[person]:
+        for tail in dag_tails(following, links):
+            yield [(movie_id, following)] + tail
+
+
+def deepen(distances, frontier, neighbors, max_depth):
+    """
+    Continues the breadth-first search whose last level is `frontier`,
+    adding {person: depth} to `distances` for everyone within
+    `max_depth`. Returns the new last level.
+    """
+    while frontier and distances[frontier[0]] < max_depth:
+        depth = distances[frontier[0]] + 1
+        nextFrontier = []
+        for person in frontier:
+            for _, neighbor in neighbors(person):
+                if neighbor not in distances:
+                    distances[neighbor] = depth
+                    nextFrontier.append(neighbor)
+        frontier = nextFrontier
+    return frontier
+
+
+def bounded_paths(source, target, length, neighbors, distances):
+    """
+    Yields the simple paths from source to target with exactly
+    `length` steps, by iterative depth-first search.
+    """
     path = []
-    node = endNode
-    while node is not None:
-        state = node.state # movie-person pair
-        path.insert(0, state) # insert at the beginning
-        node = node.parent
+    onPath = {source}
+    stack = [iter(neighbors(source))]
+    while stack:
+        step = len(stack)
+        for movie_id, person in stack[-1]:
+            if person in onPath:
+                continue
+            remaining = distances.get(person)
+            if remaining is None or step + remaining > length:
+                continue
+            if person == target:
+                if step == length:
+                    yield path + [(movie_id, person)]
+                continue
+            path.append((movie_id, person))
+            onPath.add(person)
+            stack.append(iter(neighbors(person)))
+            break
+        else:
+            stack.pop()
+            if path:
+                onPath.discard(path.pop()[1])
+
+
+def trace_path(parents, person):
+    """
+    Returns the (movie_id, person_id) path that reaches `person`,
+    following `parents` (person -> (movie_id, previous person)) back
+    to the root, in linear time.
+    """
+    path = []
+    while parents[person] is not None:
+        movie_id, previous = parents[person]
+        path.append((movie_id, person))
+        person = previous
+    path.reverse()
     return path
 
 
@@ -143,7 +595,16 @@ def person_id_for_name(name):
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
-        return None
+        suggestions = name_index.candidates(name) if name_index is not None else []
+        if len(suggestions) == 0:
+            return None
+        print(f"No '{name}'. Did you mean:")
+        for suggestion in suggestions:
+            print(f"  {display_name(suggestion)}")
+        intended = input("Intended Name: ")
+        if intended.lower() not in names:
+            return None
+        return person_id_for_name(intended)
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
         for person_id in person_ids:
@@ -162,6 +623,14 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def display_name(key):
+    """
+    Returns the name as written in the data for a lower-cased key
+    of `names`.
+    """
+    return people[min(names[key])]["name"]
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
@@ -0,0 +1,185 @@
+"""
+Streaming CSV loader for degrees.
+
+Reads people.csv, movies.csv and stars.csv in large chunks, interns
+IDs and names, and stores people and movies as `__slots__` records
+instead of per-row dicts. Records still support `record["name"]`,
+so the rest of degrees.py works unchanged.
+
+Usage: python ingest.py directory [pairs]
+compares this loader with the dict loader: time, rows/s, peak RSS
+and the path lengths of a fixed set of random queries.
+"""
+
+import csv
+import resource
+import sys
+import time
+from multiprocessing import get_context
+
+CHUNK_SIZE = 1 << 22
+
+
+class Record():
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+class Person(Record):
+    __slots__ = ("name", "birth", "movies")
+
+    def __init__(self, name, birth):
+        self.name = name
+        self.birth = birth
+        self.movies = []
+
+
+class Movie(Record):
+    __slots__ = ("title", "year", "stars")
+
+    def __init__(self, title, year):
+        self.title = title
+        self.year = year
+        self.stars = []
+
+
+def lines(filename, chunk_size=CHUNK_SIZE):
+    """
+    Yields the lines of a file, reading it `chunk_size` characters
+    at a time. Lines end only at "\n", as for csv, so other Unicode
+    line breaks inside a name stay in their row.
+    """
+    with open(filename, encoding="utf-8", newline="") as f:
+        rest = ""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            chunk = rest + chunk
+            end = chunk.rfind("\n") + 1
+            rest = chunk[end:]
+            for line in chunk[:end].split("\n")[:-1]:
+                yield line + "\n"
+        if rest:
+            yield rest
+
+
+def rows(filename, chunk_size=CHUNK_SIZE):
+    """
+    Yields CSV rows as lists. The first item yielded is a dict of
+    column name -> index read from the header.
+    """
+    reader = csv.reader(lines(filename, chunk_size))
+    header = next(reader, [])
+    yield {column: i for i, column in enumerate(header)}
+    yield from reader
+
+
+def load(directory, names, people, movies, chunk_size=CHUNK_SIZE):
+    """
+    Fill `names`, `people` and `movies` from the CSV files in
+    `directory`. Returns the number of rows read.
+    """
+    intern = sys.intern
+    count = 0
+
+    reader = rows(f"{directory}/people.csv", chunk_size)
+    columns = next(reader)
+    id_, name_, birth_ = columns["id"], columns["name"], columns["birth"]
+    for row in reader:
+        count += 1
+        person_id = intern(row[id_])
+        name = intern(row[name_])
+        people[person_id] = Person(name, row[birth_])
+        key = intern(name.lower())
+        if key not in names:
+            names[key] = {person_id}
+        else:
+            names[key].add(person_id)
+
+    reader = rows(f"{directory}/movies.csv", chunk_size)
+    columns = next(reader)
+    id_, title_, year_ = columns["id"], columns["title"], columns["year"]
+    for row in reader:
+        count += 1
+        movies[intern(row[id_])] = Movie(row[title_], row[year_])
+
+    reader = rows(f"{directory}/stars.csv", chunk_size)
+    columns = next(reader)
+    person_, movie_ = columns["person_id"], columns["movie_id"]
+    for row in reader:
+        count += 1
+        person = people.get(row[person_])
+        movie = movies.get(row[movie_])
+        if person is None or movie is None:
+            continue
+        # Use the interned keys so every reference shares one string
+        person.movies.append(intern(row[movie_]))
+        movie.stars.append(intern(row[person_]))
+
+    # Deduplicate repeated star rows; tuples are smaller than sets
+    for person in people.values():
+        person.movies = tuple(dict.fromkeys(person.movies))
+    for movie in movies.values():
+        movie.stars = tuple(dict.fromkeys(movie.stars))
+    return count
+
+
+def peak_rss():
+    """
+    Returns this process's peak resident set size in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def profile(task):
+    """
+    Loads a directory with one loader and runs sample queries.
+    Meant to run in a fresh process so peak RSS is the loader's own.
+    """
+    directory, stream, count = task
+    import benchmark
+    import degrees
+
+    start = time.perf_counter()
+    degrees.load_data(directory, stream=stream)
+    seconds = time.perf_counter() - start
+    rss = peak_rss()
+    rows_read = len(degrees.people) + len(degrees.movies)
+    rows_read += sum(1 for _ in lines(f"{directory}/stars.csv")) - 1
+    lengths, _, _ = benchmark.run("bidirectional", benchmark.random_pairs(count, 50))
+    return seconds, rows_read, rss, lengths
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python ingest.py directory [pairs]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else 100
+
+    import snapshot
+    if snapshot.is_fresh(directory):
+        sys.exit(f"{snapshot.snapshot_path(directory)} would be loaded instead of the CSVs")
+
+    results = {}
+    context = get_context("spawn")
+    for label, stream in (("dict", False), ("stream", True)):
+        with context.Pool(1) as pool:
+            results[label] = pool.apply(profile, ((directory, stream, count),))
+
+    print(f"{'loader':<10}{'seconds':>10}{'rows/s':>12}{'peak MB':>10}")
+    for label, (seconds, rows_read, rss, _) in results.items():
+        print(f"{label:<10}{seconds:>10.3f}{rows_read / seconds:>12.0f}{rss / 2 ** 20:>10.1f}")
+    if results["dict"][3] != results["stream"][3]:
+        sys.exit("Loaders returned different query results")
+    print(f"{count} queries returned identical path lengths.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Landmark (ALT) distance oracle for degrees.
+
+K high-degree people are picked as landmarks and their BFS distance
+to every person is stored. By the triangle inequality, for any
+landmark L:
+
+    |d(L, s) - d(L, t)| <= d(s, t) <= d(L, s) + d(L, t)
+
+which gives instant lower and upper bounds on the separation of s and
+t, and an admissible heuristic for A* search.
+
+The index is saved as `landmarks.idx` in the data directory. When
+the CSVs have only grown by appended rows it is updated in place;
+any other change to the CSVs triggers a full rebuild. A directory
+holding only a compiled snapshot is tracked by the snapshot file.
+
+Usage: python landmarks.py directory [landmarks]
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import struct
+import sys
+from array import array
+
+import snapshot
+
+INDEX_NAME = "landmarks.idx"
+CSV_FILES = ("people.csv", "movies.csv", "stars.csv")
+MAGIC = b"DEGLMK01"
+LANDMARKS = 16
+
+# Distances are stored as unsigned shorts
+DISTANCE = "H"
+UNREACHABLE = 0xFFFF
+
+
+def index_path(directory):
+    return os.path.join(directory, INDEX_NAME)
+
+
+def file_state(filename, length=None):
+    """
+    Returns {"size", "mtime", "sha"} for a file, hashing only the first
+    `length` bytes if given.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    remaining = os.path.getsize(filename) if length is None else length
+    with open(filename, "rb") as f:
+        while remaining > 0:
+            chunk = f.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return {
+        "size": os.path.getsize(filename) if length is None else length,
+        "mtime": os.path.getmtime(filename),
+        "sha": digest.hexdigest()
+    }
+
+
+def source_files(directory):
+    """
+    Returns {name: path} of the files the graph was loaded from: the
+    CSVs, or the snapshot if the directory lacks any of them.
+    """
+    files = {name: os.path.join(directory, name) for name in CSV_FILES}
+    if all(os.path.exists(path) for path in files.values()):
+        return files
+    path = snapshot.snapshot_path(directory)
+    if os.path.exists(path):
+        return {snapshot.SNAPSHOT_NAME: path}
+    raise ValueError(f"{directory} has neither {', '.join(CSV_FILES)} nor a snapshot")
+
+
+def fingerprint(directory):
+    return {name: file_state(path) for name, path in source_files(directory).items()}
+
+
+def degree(graph, person):
+    """
+    Returns the number of (movie, co-star) links of a person.
+    """
+    offsets = graph.movie_star_offsets
+    return sum(offsets[movie + 1] - offsets[movie] - 1 for movie in graph.movies_of(person))
+
+
+def bfs_distances(graph, source):
+    """
+    Returns an array of the degrees of separation from `source` to
+    every person, UNREACHABLE where there is no path.
+    """
+    distances = array(DISTANCE, [UNREACHABLE]) * graph.person_count
+    seenMovies = bytearray(graph.movie_count)
+    distances[source] = 0
+    frontier = [source]
+    depth = 0
+    while frontier:
+        depth += 1
+        nextFrontier = []
+        for person in frontier:
+            for movie in graph.movies_of(person):
+                if seenMovies[movie]:
+                    continue
+                seenMovies[movie] = 1
+                for star in graph.stars_of(movie):
+                    if distances[star] == UNREACHABLE:
+                        distances[star] = depth
+                        nextFrontier.append(star)
+        frontier = nextFrontier
+    return distances
+
+
+def relax(graph, distances, seeds):
+    """
+    Propagates distance decreases after links were added, starting
+    from `seeds`, the people whose distance may have dropped.
+    """
+    heap = [(distances[person], person) for person in seeds
+            if distances[person] != UNREACHABLE]
+    heapq.heapify(heap)
+    while heap:
+        d, person = heapq.heappop(heap)
+        if d != distances[person]:
+            continue
+        for movie in graph.movies_of(person):
+            for star in graph.stars_of(movie):
+                if d + 1 < distances[star]:
+                    distances[star] = d + 1
+                    heapq.heappush(heap, (d + 1, star))
+
+
+class LandmarkIndex():
+    """
+    Landmark person indices and their distance arrays, over the person
+    indices of a snapshot.Snapshot or costars.Graph.
+    """
+
+    def __init__(self, graph, k, landmarks, distances, files=None):
+        self.graph = graph
+        self.k = k
+        self.landmarks = landmarks
+        self.distances = distances
+        self.files = files or {}
+
+    @classmethod
+    def build(cls, graph, k=LANDMARKS):
+        """
+        Picks the `k` people with the most co-star links, one per
+        connected movie neighbourhood, and runs a BFS from each.
+        """
+        order = sorted(range(graph.person_count), key=lambda p: degree(graph, p), reverse=True)
+        landmarks = []
+        distances = []
+        covered = set()
+        for person in order:
+            if len(landmarks) == k:
+                break
+            # Skip direct co-stars of a landmark: their distances add little
+            if person in covered:
+                continue
+            landmarks.append(person)
+            distances.append(bfs_distances(graph, person))
+            covered.update(star for movie in graph.movies_of(person)
+                           for star in graph.stars_of(movie))
+        return cls(graph, k, landmarks, distances)
+
+    def person_index(self, person_id):
+        return self.graph.person_index(person_id)
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation of
+        two person indices. Both are None if some landmark proves them
+        disconnected; upper is None if no landmark reaches either.
+        """
+        lower = 0
+        upper = None
+        for distances in self.distances:
+            s, t = distances[source], distances[target]
+            if s == UNREACHABLE and t == UNREACHABLE:
+                continue
+            if s == UNREACHABLE or t == UNREACHABLE:
+                return None, None
+            lower = max(lower, abs(s - t))
+            upper = s + t if upper is None else min(upper, s + t)
+        return lower, upper
+
+    def lower_bound(self, source, target):
+        """
+        Admissible A* heuristic: the best landmark lower bound.
+        """
+        lower = 0
+        for distances in self.distances:
+            s, t = distances[source], distances[target]
+            if s != UNREACHABLE and t != UNREACHABLE and abs(s - t) > lower:
+                lower = abs(s - t)
+        return lower
+
+    def update(self, links):
+        """
+        Updates distances after (person, movie) links were added to
+        the graph, which must already contain them.
+        """
+        for distances in self.distances:
+            grown = self.graph.person_count - len(distances)
+            distances.extend(array(DISTANCE, [UNREACHABLE]) * grown)
+        for distances in self.distances:
+            seeds = set()
+            for person, movie in links:
+                stars = self.graph.stars_of(movie)
+                best = min(distances[star] for star in stars)
+                if best == UNREACHABLE:
+                    continue
+                for star in stars:
+                    if distances[star] > best + 1:
+                        distances[star] = best + 1
+                    seeds.add(star)
+            relax(self.graph, distances, seeds)
+
+    def save(self, filename):
+        metadata = json.dumps({
+            "k": self.k,
+            "landmarks": self.landmarks,
+            "people": self.graph.person_count,
+            "files": self.files
+        }).encode("utf-8")
+        tmp = f"{filename}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("=I", len(metadata)) + metadata)
+            for distances in self.distances:
+                distances.tofile(f)
+        os.replace(tmp, filename)
+
+    @classmethod
+    def load(cls, graph, filename):
+        with open(filename, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise Exception(f"{filename} is not a landmark index")
+            length, = struct.unpack("=I", f.read(4))
+            metadata = json.loads(f.read(length))
+            distances = []
+            for _ in metadata["landmarks"]:
+                row = array(DISTANCE)
+                row.fromfile(f, metadata["people"])
+                distances.append(row)
+        return cls(graph, metadata["k"], metadata["landmarks"], distances, metadata["files"])
+
+
+def appended_only(filename, old_state):
+    """
+    Returns True if `filename` is the file described by `old_state`
+    with zero or more bytes appended.
+    """
+    if os.path.getsize(filename) < old_state["size"]:
+        return False
+    return file_state(filename, old_state["size"])["sha"] == old_state["sha"]
+
+
+def appended_links(directory, graph, old_state):
+    """
+    Returns the (person, movie) index links in the rows appended to
+    stars.csv since `old_state`.
+    """
+    links = []
+    with open(os.path.join(directory, "stars.csv"), "rb") as f:
+        f.seek(old_state["size"])
+        for line in f.read().decode("utf-8").splitlines():
+            fields = line.strip().split(",")
+            if len(fields) != 2:
+                continue
+            person = graph.person_index(fields[0])
+            movie = graph.movie_index(fields[1])
+            if person is not None and movie is not None:
+                links.append((person, movie))
+    return links
+
+
+def load_or_build(directory, graph, k=LANDMARKS):
+    """
+    Returns the landmark index for `directory`, loading it from disk,
+    updating it for rows appended to the CSVs, or rebuilding it.
+    """
+    filename = index_path(directory)
+    files = source_files(directory)
+    if os.path.exists(filename):
+        index = LandmarkIndex.load(graph, filename)
+        old = index.files
+        if index.k == k and set(old) == set(files) and all(
+                old[name]["size"] == os.path.getsize(path)
+                and old[name]["mtime"] == os.path.getmtime(path)
+                for name, path in files.items()):
+            return index
+
+        # Appended rows keep every existing person and movie index,
+        # and new links can only shorten distances
+        if index.k == k and set(old) == set(files) and "stars.csv" in files \
+                and all(appended_only(path, old[name]) for name, path in files.items()):
+            index.update(appended_links(directory, graph, old["stars.csv"]))
+            index.files = fingerprint(directory)
+            index.save(filename)
+            return index
+
+    index = LandmarkIndex.build(graph, k)
+    index.files = fingerprint(directory)
+    index.save(filename)
+    return index
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python landmarks.py directory [landmarks]")
+    directory = sys.argv[1]
+    k = int(sys.argv[2]) if len(sys.argv) == 3 else LANDMARKS
+
+    import degrees
+    degrees.load_data(directory)
+    index = degrees.build_landmark_index(directory, k)
+    names = [degrees.people[index.graph.person_id(p)]["name"] for p in index.landmarks]
+    print(f"{len(index.landmarks)} landmarks: {', '.join(names)}")
+    print(f"Saved to {index_path(directory)}")
+
+
+if __name__ == "__main__":
+    main()
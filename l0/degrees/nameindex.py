@@ -0,0 +1,240 @@
+"""
+Prefix and typo-tolerant name lookup for degrees.
+
+Lower-cased names are kept sorted for prefix search by bisection.
+
+For typos, names are split into tokens ("tom", "hanks"). Every
+distinct token and each of its one-letter deletions is hashed into a
+sorted array, so the tokens within one edit of a query token are
+found with a handful of binary searches (two strings are within one
+edit when they share a deletion variant). The query token whose
+matches appear in the fewest names then anchors the search. Of
+those names, the ones whose length is close enough and that share a
+near token with every other query token are checked with a bounded
+Levenshtein distance.
+A name is found when it is within `max_distance` edits of the query
+and the anchor token is within one edit of one of its tokens; queries
+whose every token matches hundreds of names are too vague to check
+and get no typo matches.
+
+Usage: python nameindex.py directory [queries]
+runs a latency benchmark over typo'd and truncated names.
+"""
+
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+MAX_DISTANCE = 2
+LIMIT = 10
+
+# Names an anchor token may match before the query is deemed too vague
+CANDIDATE_BUDGET = 250
+
+
+def deletions(token):
+    """
+    Returns the token and every string made by deleting one letter.
+    """
+    variants = {token}
+    for i in range(len(token)):
+        variants.add(token[:i] + token[i + 1:])
+    return variants
+
+
+def edit_distance(a, b, limit):
+    """
+    Returns the Levenshtein distance between a and b, or limit + 1
+    as soon as it is known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(cost)
+            best = min(best, cost)
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class NameIndex():
+    """
+    Built from a mapping of lower-cased name -> set of person_ids,
+    the shape of `degrees.names`.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.sorted = sorted(names)
+
+        # token -> indices into self.sorted of the names containing it
+        postings = {}
+        for i, name in enumerate(self.sorted):
+            for token in set(name.split()):
+                if token not in postings:
+                    postings[token] = array("I")
+                postings[token].append(i)
+        self.tokens = list(postings)
+        self.postings = [postings[token] for token in self.tokens]
+
+        # Parallel arrays of deletion-variant hash -> token, sorted by hash
+        hashes = array("q")
+        owners = array("I")
+        for t, token in enumerate(self.tokens):
+            for variant in deletions(token):
+                hashes.append(hash(variant))
+                owners.append(t)
+        order = sorted(range(len(hashes)), key=hashes.__getitem__)
+        self.hashes = array("q", (hashes[i] for i in order))
+        self.owners = array("I", (owners[i] for i in order))
+
+    def prefix(self, query, limit=LIMIT):
+        """
+        Returns up to `limit` names starting with `query`, in order.
+        """
+        query = query.lower()
+        i = bisect_left(self.sorted, query)
+        matches = []
+        while i < len(self.sorted) and len(matches) < limit \
+                and self.sorted[i].startswith(query):
+            matches.append(self.sorted[i])
+            i += 1
+        return matches
+
+    def similar_tokens(self, token):
+        """
+        Returns the indices of known tokens within one edit of `token`.
+        """
+        found = set()
+        for variant in deletions(token):
+            key = hash(variant)
+            start = bisect_left(self.hashes, key)
+            end = bisect_right(self.hashes, key, start)
+            for t in self.owners[start:end]:
+                if t not in found and edit_distance(token, self.tokens[t], 1) <= 1:
+                    found.add(t)
+        return found
+
+    def fuzzy(self, query, limit=LIMIT, max_distance=MAX_DISTANCE):
+        """
+        Returns up to `limit` (distance, name) pairs within
+        `max_distance` edits of `query`, closest first.
+        """
+        query = query.lower()
+        similar = {}
+        anchor = None
+        anchor_size = 0
+        for token in set(query.split()):
+            similar[token] = self.similar_tokens(token)
+            size = sum(len(self.postings[t]) for t in similar[token])
+            if size and (anchor is None or size < anchor_size):
+                anchor, anchor_size = token, size
+        if anchor is None or anchor_size > CANDIDATE_BUDGET:
+            return []
+
+        # Cheap tests first: a name must be about as long as the query
+        # and hold a token within one edit of each other query token
+        # that has any
+        others = [{self.tokens[t] for t in matches} for token, matches in similar.items()
+                  if token != anchor and matches]
+        candidates = set()
+        for t in similar[anchor]:
+            candidates.update(self.postings[t])
+        matches = []
+        for i in candidates:
+            name = self.sorted[i]
+            if abs(len(name) - len(query)) > max_distance:
+                continue
+            if others:
+                tokens = name.split()
+                if any(other.isdisjoint(tokens) for other in others):
+                    continue
+            distance = edit_distance(query, name, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, name))
+        matches.sort()
+        return matches[:limit]
+
+    def candidates(self, query, limit=LIMIT, max_distance=MAX_DISTANCE):
+        """
+        Returns up to `limit` ranked names for a query: an exact
+        match, then prefix completions, then the closest typo matches.
+        A blank query has no candidates.
+        """
+        query = query.lower()
+        if not query.strip():
+            return []
+        ranked = []
+        if query in self.names:
+            ranked.append(query)
+        for name in self.prefix(query, limit + 1):
+            if name not in ranked:
+                ranked.append(name)
+        if len(ranked) >= limit:
+            return ranked[:limit]
+        for _, name in self.fuzzy(query, limit, max_distance):
+            if name not in ranked:
+                ranked.append(name)
+        return ranked[:limit]
+
+
+def typo(name, rng):
+    """
+    Returns `name` with one random deletion, insertion, substitution
+    or truncation.
+    """
+    i = rng.randrange(len(name))
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    kind = rng.randrange(4)
+    if kind == 0:
+        return name[:i] + name[i + 1:]
+    if kind == 1:
+        return name[:i] + letter + name[i:]
+    if kind == 2:
+        return name[:i] + letter + name[i + 1:]
+    return name[:max(3, i)]
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python nameindex.py directory [queries]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else 1000
+
+    import degrees
+    degrees.load_data(directory)
+    start = time.perf_counter()
+    index = degrees.build_name_index()
+    print(f"Indexed {len(index.sorted)} names in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(50)
+    names = [name for name in index.sorted if len(name) >= 4]
+    queries = []
+    for _ in range(count):
+        name = rng.choice(names)
+        queries.append((name, typo(name, rng)))
+
+    seconds = []
+    found = 0
+    for name, query in queries:
+        start = time.perf_counter()
+        ranked = index.candidates(query)
+        seconds.append(time.perf_counter() - start)
+        found += name in ranked
+    seconds.sort()
+    print(f"{count} queries: mean {1000 * sum(seconds) / count:.3f} ms, "
+          f"p50 {1000 * seconds[count // 2]:.3f} ms, "
+          f"p99 {1000 * seconds[min(count - 1, count * 99 // 100)]:.3f} ms")
+    print(f"Intended name in top {LIMIT}: {100 * found / count:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Batch and server front ends for degrees that load the graph once
+and answer many queries against it.
+
+Usage:
+    python service.py batch directory [pairs.tsv]
+        Reads one "source<TAB>target" pair per line (names or person
+        IDs) from the file or stdin and writes one JSON result per line.
+    python service.py serve directory [port]
+        Serves GET /path?source=...&target=... and GET /stats on
+        localhost, answering requests on concurrent threads.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import degrees
+
+MODE = "bidirectional"
+CACHE_SIZE = 65536
+PORT = 8050
+
+
+def resolve_person(value):
+    """
+    Returns the person_id for a person ID or an unambiguous name.
+    Raises ValueError otherwise.
+    """
+    if value in degrees.people:
+        return value
+    person_ids = degrees.names.get(value.lower(), set())
+    if len(person_ids) == 0:
+        suggestions = degrees.name_index.candidates(value, 5)
+        if suggestions:
+            suggestions = ", ".join(map(degrees.display_name, suggestions))
+            raise ValueError(f"person not found: {value} (did you mean: {suggestions})")
+        raise ValueError(f"person not found: {value}")
+    if len(person_ids) > 1:
+        raise ValueError(f"ambiguous name: {value} ({', '.join(sorted(person_ids))})")
+    return next(iter(person_ids))
+
+
+def answer(source, target):
+    """
+    Returns a JSON-serializable result for one query.
+    """
+    result = {"source": source, "target": target}
+    try:
+        path = degrees.shortest_path(resolve_person(source), resolve_person(target), mode=MODE)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+    if path is None:
+        result["degrees"] = None
+        result["path"] = None
+    else:
+        result["degrees"] = len(path)
+        result["path"] = [{"movie_id": movie_id, "person_id": person_id}
+                          for movie_id, person_id in path]
+    return result
+
+
+def load(directory):
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(directory)
+    degrees.build_costar_index(cache_size=CACHE_SIZE)
+    degrees.build_name_index()
+    print("Data loaded.", file=sys.stderr)
+
+
+def run_batch(lines, out):
+    """
+    Answers every "source<TAB>target" line, writing JSONL to `out`.
+    Returns (queries answered, seconds).
+    """
+    count = 0
+    start = time.perf_counter()
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+        fields = line.split("\t")
+        if len(fields) != 2:
+            result = {"line": line, "error": "expected source<TAB>target"}
+        else:
+            result = answer(fields[0].strip(), fields[1].strip())
+        out.write(json.dumps(result) + "\n")
+        count += 1
+    return count, time.perf_counter() - start
+
+
+class Stats():
+    """
+    Thread-safe query counter for the server.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.busy = 0.0
+
+    def record(self, seconds):
+        with self.lock:
+            self.queries += 1
+            self.busy += seconds
+
+    def report(self):
+        with self.lock:
+            uptime = time.perf_counter() - self.started
+            return {
+                "queries": self.queries,
+                "uptime": uptime,
+                "qps": self.queries / uptime if uptime else 0.0,
+                "mean_ms": 1000 * self.busy / self.queries if self.queries else None
+            }
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    stats = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            self.send_json(200, self.stats.report())
+        elif url.path == "/path":
+            query = parse_qs(url.query)
+            if "source" not in query or "target" not in query:
+                self.send_json(400, {"error": "source and target are required"})
+                return
+            start = time.perf_counter()
+            result = answer(query["source"][0], query["target"][0])
+            self.stats.record(time.perf_counter() - start)
+            self.send_json(200, result)
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port):
+    Handler.stats = Stats()
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    print(f"Serving on http://127.0.0.1:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        report = Handler.stats.report()
+        print(f"{report['queries']} queries, {report['qps']:.1f} queries/s", file=sys.stderr)
+
+
+def main():
+    usage = "Usage: python service.py batch directory [pairs.tsv]\n" \
+            "       python service.py serve directory [port]"
+    if len(sys.argv) not in (3, 4) or sys.argv[1] not in ("batch", "serve"):
+        sys.exit(usage)
+    command, directory = sys.argv[1], sys.argv[2]
+    load(directory)
+
+    if command == "serve":
+        serve(int(sys.argv[3]) if len(sys.argv) == 4 else PORT)
+        return
+
+    if len(sys.argv) == 4:
+        with open(sys.argv[3], encoding="utf-8") as f:
+            count, seconds = run_batch(f, sys.stdout)
+    else:
+        count, seconds = run_batch(sys.stdin, sys.stdout)
+    qps = count / seconds if seconds else 0.0
+    print(f"{count} queries in {seconds:.3f}s, {qps:.1f} queries/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+Binary, memory-mapped snapshot of the degrees graph.
+
+`python snapshot.py directory` compiles people.csv, movies.csv and
+stars.csv into `directory/graph.snap`. Person and movie IDs are
+interned to integer indices and the graph is stored as two CSR
+(compressed sparse row) tables: person -> movies and movie -> stars.
+
+Opening a snapshot only maps the file, so start-up is fast and the
+pages are shared between every process that opens the same file.
+"""
+
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+SNAPSHOT_NAME = "graph.snap"
+MAGIC = b"DEGSNAP1"
+
+# magic, byte order, section count
+HEADER = struct.Struct("=8sBxxxI")
+# name, typecode, offset, length in bytes
+SECTION = struct.Struct("=16sc7xQQ")
+
+INDEX = "I"
+OFFSET = "Q"
+BYTE_ORDERS = {"little": 0, "big": 1}
+
+
+def snapshot_path(directory):
+    """
+    Returns the path of the snapshot file for a data directory.
+    """
+    return os.path.join(directory, SNAPSHOT_NAME)
+
+
+def is_fresh(directory):
+    """
+    Returns True if the directory has a snapshot that is newer than
+    all of its CSV files.
+    """
+    path = snapshot_path(directory)
+    if not os.path.exists(path):
+        return False
+    built = os.path.getmtime(path)
+    for name in ("people.csv", "movies.csv", "stars.csv"):
+        csv_path = os.path.join(directory, name)
+        if os.path.exists(csv_path) and os.path.getmtime(csv_path) > built:
+            return False
+    return True
+
+
+def string_table(strings):
+    """
+    Returns (offsets, data) for a list of strings: the UTF-8 bytes of
+    string i are data[offsets[i]:offsets[i + 1]].
+    """
+    offsets = array(OFFSET, [0])
+    data = bytearray()
+    for string in strings:
+        data += string.encode("utf-8")
+        offsets.append(len(data))
+    return offsets, bytes(data)
+
+
+def csr(rows, edges):
+    """
+    Returns (offsets, targets) for `edges`, a list of (row, target)
+    pairs over `rows` rows. Targets of each row are sorted.
+    """
+    counts = [0] * (rows + 1)
+    for row, _ in edges:
+        counts[row + 1] += 1
+    for i in range(rows):
+        counts[i + 1] += counts[i]
+    offsets = array(INDEX, counts)
+    targets = array(INDEX, bytes(len(edges) * offsets.itemsize))
+    fill = counts[:-1]
+    for row, target in sorted(edges):
+        targets[fill[row]] = target
+        fill[row] += 1
+    return offsets, targets
+
+
+def compile_snapshot(directory, filename=None):
+    """
+    Parse the CSV files in `directory` and write a binary snapshot.
+    Returns the path of the written file.
+    """
+    filename = filename or snapshot_path(directory)
+
+    person_ids = []
+    person_names = []
+    person_births = []
+    person_index = {}
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["id"] in person_index:
+                continue
+            person_index[row["id"]] = len(person_ids)
+            person_ids.append(row["id"])
+            person_names.append(row["name"])
+            person_births.append(row["birth"])
+
+    movie_ids = []
+    movie_titles = []
+    movie_years = []
+    movie_index = {}
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["id"] in movie_index:
+                continue
+            movie_index[row["id"]] = len(movie_ids)
+            movie_ids.append(row["id"])
+            movie_titles.append(row["title"])
+            movie_years.append(row["year"])
+
+    stars = set()
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            person = person_index.get(row["person_id"])
+            movie = movie_index.get(row["movie_id"])
+            if person is not None and movie is not None:
+                stars.add((person, movie))
+
+    person_movies = csr(len(person_ids), list(stars))
+    movie_stars = csr(len(movie_ids), [(m, p) for p, m in stars])
+
+    sections = {}
+    for name, strings in (("person_id", person_ids),
+                          ("person_name", person_names),
+                          ("person_birth", person_births),
+                          ("movie_id", movie_ids),
+                          ("movie_title", movie_titles),
+                          ("movie_year", movie_years)):
+        offsets, data = string_table(strings)
+        sections[f"{name}.off"] = offsets
+        sections[f"{name}.dat"] = data
+    sections["pm.off"], sections["pm.adj"] = person_movies
+    sections["ms.off"], sections["ms.adj"] = movie_stars
+
+    # Sorted orders for binary search by ID and by lower-cased name
+    sections["person_by_id"] = array(
+        INDEX, sorted(range(len(person_ids)), key=lambda i: person_ids[i]))
+    sections["movie_by_id"] = array(
+        INDEX, sorted(range(len(movie_ids)), key=lambda i: movie_ids[i]))
+    sections["person_by_name"] = array(
+        INDEX, sorted(range(len(person_ids)),
+                      key=lambda i: person_names[i].lower()))
+
+    write_sections(filename, sections)
+    return filename
+
+
+def write_sections(filename, sections):
+    """
+    Write named arrays (or raw bytes) to `filename` in snapshot format.
+    Every section starts on an 8-byte boundary.
+    """
+    position = HEADER.size + SECTION.size * len(sections)
+    table = []
+    payloads = []
+    for name, values in sections.items():
+        payload = values.tobytes() if isinstance(values, array) else values
+        typecode = values.typecode if isinstance(values, array) else "B"
+        position += -position % 8
+        table.append(SECTION.pack(name.encode("ascii"), typecode.encode("ascii"),
+                                  position, len(payload)))
+        payloads.append((position, payload))
+        position += len(payload)
+
+    tmp = f"{filename}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, BYTE_ORDERS[sys.byteorder], len(sections)))
+        for entry in table:
+            f.write(entry)
+        for offset, payload in payloads:
+            f.write(bytes(offset - f.tell()))
+            f.write(payload)
+    os.replace(tmp, filename)
+
+
+class Snapshot():
+    """
+    Read-only view of a compiled snapshot. People and movies are
+    addressed by integer index; arrays are zero-copy memoryviews
+    over the mapped file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self.mmap)
+
+        magic, byte_order, count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise Exception(f"{filename} is not a degrees snapshot")
+        if byte_order != BYTE_ORDERS[sys.byteorder]:
+            raise Exception(f"{filename} was built on a different byte order")
+
+        self.sections = {}
+        for i in range(count):
+            name, typecode, offset, length = SECTION.unpack_from(
+                buffer, HEADER.size + i * SECTION.size)
+            view = buffer[offset:offset + length]
+            self.sections[name.rstrip(b"\0").decode("ascii")] = \
+                view.cast(typecode.decode("ascii"))
+
+        self.person_movie_offsets = self.sections["pm.off"]
+        self.person_movies = self.sections["pm.adj"]
+        self.movie_star_offsets = self.sections["ms.off"]
+        self.movie_stars = self.sections["ms.adj"]
+        self.person_count = len(self.person_movie_offsets) - 1
+        self.movie_count = len(self.movie_star_offsets) - 1
+
+    def close(self):
+        for view in self.sections.values():
+            view.release()
+        self.sections = {}
+        self.person_movie_offsets = self.person_movies = None
+        self.movie_star_offsets = self.movie_stars = None
+        self.mmap.close()
+
+    def string(self, table, i):
+        offsets = self.sections[f"{table}.off"]
+        return bytes(self.sections[f"{table}.dat"][offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def person_id(self, person):
+        return self.string("person_id", person)
+
+    def person_name(self, person):
+        return self.string("person_name", person)
+
+    def person_birth(self, person):
+        return self.string("person_birth", person)
+
+    def movie_id(self, movie):
+        return self.string("movie_id", movie)
+
+    def movie_title(self, movie):
+        return self.string("movie_title", movie)
+
+    def movie_year(self, movie):
+        return self.string("movie_year", movie)
+
+    def movies_of(self, person):
+        """
+        Returns the movie indices a person starred in.
+        """
+        offsets = self.person_movie_offsets
+        return self.person_movies[offsets[person]:offsets[person + 1]]
+
+    def stars_of(self, movie):
+        """
+        Returns the person indices that starred in a movie.
+        """
+        offsets = self.movie_star_offsets
+        return self.movie_stars[offsets[movie]:offsets[movie + 1]]
+
+    def person_index(self, person_id):
+        """
+        Returns the index for an IMDB person id, or None.
+        """
+        order = self.sections["person_by_id"]
+        i = bisect_left(order, person_id, key=self.person_id)
+        if i < len(order) and self.person_id(order[i]) == person_id:
+            return order[i]
+        return None
+
+    def movie_index(self, movie_id):
+        """
+        Returns the index for an IMDB movie id, or None.
+        """
+        order = self.sections["movie_by_id"]
+        i = bisect_left(order, movie_id, key=self.movie_id)
+        if i < len(order) and self.movie_id(order[i]) == movie_id:
+            return order[i]
+        return None
+
+    def people_named(self, name):
+        """
+        Returns the person indices whose lower-cased name is `name`.
+        """
+        order = self.sections["person_by_name"]
+        key = lambda i: self.person_name(i).lower()
+        i = bisect_left(order, name, key=key)
+        people = []
+        while i < len(order) and key(order[i]) == name:
+            people.append(order[i])
+            i += 1
+        return people
+
+
+class PeopleView(Mapping):
+    """
+    Exposes a snapshot with the same shape as `degrees.people`:
+    person_id -> {"name", "birth", "movies"}.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, person_id):
+        s = self.snapshot
+        person = s.person_index(person_id)
+        if person is None:
+            raise KeyError(person_id)
+        return {
+            "name": s.person_name(person),
+            "birth": s.person_birth(person),
+            "movies": {s.movie_id(movie) for movie in s.movies_of(person)}
+        }
+
+    def __iter__(self):
+        return (self.snapshot.person_id(i) for i in range(self.snapshot.person_count))
+
+    def __len__(self):
+        return self.snapshot.person_count
+
+
+class MoviesView(Mapping):
+    """
+    Exposes a snapshot with the same shape as `degrees.movies`:
+    movie_id -> {"title", "year", "stars"}.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, movie_id):
+        s = self.snapshot
+        movie = s.movie_index(movie_id)
+        if movie is None:
+            raise KeyError(movie_id)
+        return {
+            "title": s.movie_title(movie),
+            "year": s.movie_year(movie),
+            "stars": {s.person_id(person) for person in s.stars_of(movie)}
+        }
+
+    def __iter__(self):
+        return (self.snapshot.movie_id(i) for i in range(self.snapshot.movie_count))
+
+    def __len__(self):
+        return self.snapshot.movie_count
+
+
+class NamesView(Mapping):
+    """
+    Exposes a snapshot with the same shape as `degrees.names`:
+    lower-cased name -> set of person_ids.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, name):
+        people = self.snapshot.people_named(name)
+        if not people:
+            raise KeyError(name)
+        return {self.snapshot.person_id(person) for person in people}
+
+    def __iter__(self):
+        s = self.snapshot
+        seen = set()
+        for person in s.sections["person_by_name"]:
+            name = s.person_name(person).lower()
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python snapshot.py directory")
+    directory = sys.argv[1]
+    print("Compiling snapshot...")
+    filename = compile_snapshot(directory)
+    s = Snapshot(filename)
+    print(f"Wrote {filename}: {s.person_count} people, {s.movie_count} movies, "
+          f"{len(s.person_movies)} stars, {os.path.getsize(filename)} bytes.")
+    s.close()
+
+
+if __name__ == "__main__":
+    main()
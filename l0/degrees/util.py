@@ -1,3 +1,6 @@
+from collections import deque
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -5,15 +8,34 @@ class Node():
         self.action = action
 
 
+class SearchStats():
+    """
+    Counters filled in by a search, to compare search strategies.
+    """
+
+    def __init__(self):
+        self.expanded = 0
+        self.enqueued = 0
+        self.duplicates = 0
+        self.peak_frontier = 0
+
+    def __repr__(self):
+        return (f"SearchStats(expanded={self.expanded}, enqueued={self.enqueued}, "
+                f"duplicates={self.duplicates}, peak_frontier={self.peak_frontier})")
+
+
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        # state -> number of nodes in the frontier with that state
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -22,10 +44,17 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.discard_state(node.state)
             return node
 
+    def discard_state(self, state):
+        count = self.states[state]
+        if count == 1:
+            del self.states[state]
+        else:
+            self.states[state] = count - 1
+
 
 class QueueFrontier(StackFrontier):
 
@@ -33,6 +62,6 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            node = self.frontier.popleft()
+            self.discard_state(node.state)
             return node
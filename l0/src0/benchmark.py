@@ -0,0 +1,283 @@
+"""
+Benchmarks Maze.solve on generated mazes.
+
+Usage: python benchmark.py frontiers [size ...]
+    compares the deque + state-count frontiers with the original
+    list-copying ones. The list frontiers are quadratic, so they are
+    skipped when the new frontier explored more than BASELINE_MAX states.
+Usage: python benchmark.py solvers [size ...]
+    compares every solver in SOLVERS on unweighted and weighted mazes.
+Usage: python benchmark.py backends [size ...]
+    compares loading and solving with list-of-lists walls and with
+    the compact Grid backend.
+Usage: python benchmark.py jumps [size ...]
+    compares BFS, A* and Jump Point Search on open-room mazes.
+Usage: python benchmark.py report output.csv|output.json [size ...]
+    runs every solver on every generate.py layout at each size, each
+    solve in a fresh process so its peak RSS is its own, and writes
+    one row per run to a CSV or JSON report.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import generate
+from maze import Maze, StackFrontier, QueueFrontier, SOLVERS
+
+SIZES = [100, 300, 1000]
+BASELINE_MAX = 100000
+WALL_DENSITY = 0.25
+
+
+class ListStackFrontier():
+    """
+    The original frontier: pops copy the list, lookups scan it.
+    """
+
+    def __init__(self):
+        self.frontier = []
+
+    def add(self, node):
+        self.frontier.append(node)
+
+    def contains_state(self, state):
+        return any(node.state == state for node in self.frontier)
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def improves(self, state, cost):
+        return False
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier[-1]
+            self.frontier = self.frontier[:-1]
+            return node
+
+
+class ListQueueFrontier(ListStackFrontier):
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier[0]
+            self.frontier = self.frontier[1:]
+            return node
+
+
+def random_maze(size, density=WALL_DENSITY, seed=0, weighted=False):
+    """
+    Returns the text of a size x size maze with random walls, A in
+    the top-left corner and B in the bottom-right one. If `weighted`,
+    open cells get random costs 1-9.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(size):
+        row = []
+        for j in range(size):
+            if rng.random() < density:
+                row.append("#")
+            else:
+                row.append(str(rng.randint(1, 9)) if weighted else " ")
+        rows.append("".join(row))
+    rows[0] = "A" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "B"
+    return "\n".join(rows) + "\n"
+
+
+def timed_solve(filename, frontier):
+    """
+    Returns (explored, seconds) for solving a maze file, or
+    (None, seconds) if it has no solution.
+    """
+    m = Maze(filename)
+    start = time.perf_counter()
+    try:
+        m.solve(frontier=frontier)
+    except Exception:
+        return None, time.perf_counter() - start
+    return m.num_explored, time.perf_counter() - start
+
+
+def compare_frontiers(directory, sizes):
+    frontiers = [
+        ("stack", StackFrontier, ListStackFrontier),
+        ("queue", QueueFrontier, ListQueueFrontier)
+    ]
+    print(f"{'size':>6} {'frontier':<9}{'explored':>10}{'new s':>10}{'list s':>10}{'speedup':>9}")
+    for size in sizes:
+        filename = os.path.join(directory, f"maze{size}.txt")
+        with open(filename, "w") as f:
+            f.write(random_maze(size))
+        for label, new, baseline in frontiers:
+            explored, seconds = timed_solve(filename, new())
+            if explored is not None and explored <= BASELINE_MAX:
+                _, baseline_seconds = timed_solve(filename, baseline())
+                old = f"{baseline_seconds:>10.3f}{baseline_seconds / seconds:>8.1f}x"
+            else:
+                old = f"{'skipped':>10}{'':>9}"
+            print(f"{size:>6} {label:<9}{explored if explored is not None else 'none':>10}"
+                  f"{seconds:>10.3f}{old}")
+
+
+def compare_solvers(directory, sizes):
+    print(f"{'size':>6} {'weights':<9}{'solver':<10}{'explored':>10}{'cost':>8}"
+          f"{'seconds':>10}{'peak MB':>10}")
+    for size in sizes:
+        for weighted in (False, True):
+            filename = os.path.join(directory, f"maze{size}{'w' if weighted else ''}.txt")
+            with open(filename, "w") as f:
+                f.write(random_maze(size, weighted=weighted))
+            for solver in SOLVERS:
+                if weighted and solver == "jps":
+                    continue
+                m = Maze(filename)
+                try:
+                    m.solve(solver)
+                except Exception:
+                    print(f"{size:>6} {'1-9' if weighted else '1':<9}{solver:<10}{'none':>10}")
+                    continue
+                seconds = m.solve_time
+                # Separate traced run: tracing inflates the time
+                m.solve(solver, trace_memory=True)
+                print(f"{size:>6} {'1-9' if weighted else '1':<9}{solver:<10}"
+                      f"{m.num_explored:>10}{m.solution_cost:>8}{seconds:>10.3f}"
+                      f"{m.peak_memory / 2 ** 20:>10.2f}")
+
+
+def compare_backends(directory, sizes, solver="astar"):
+    print(f"{'size':>6} {'backend':<9}{'explored':>10}{'load s':>10}{'solve s':>10}"
+          f"{'peak MB':>10}")
+    for size in sizes:
+        filename = os.path.join(directory, f"maze{size}.txt")
+        with open(filename, "w") as f:
+            f.write(random_maze(size))
+        for label, compact in (("lists", False), ("grid", True)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            m = Maze(filename, compact=compact)
+            loaded = time.perf_counter() - start
+            try:
+                m.solve(solver)
+            except Exception:
+                tracemalloc.stop()
+                print(f"{size:>6} {label:<9}{'none':>10}")
+                continue
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            # Untraced run for the time
+            m.solve(solver)
+            print(f"{size:>6} {label:<9}{m.num_explored:>10}{loaded:>10.3f}"
+                  f"{m.solve_time:>10.3f}{peak / 2 ** 20:>10.2f}")
+
+
+def compare_jumps(directory, sizes):
+    print(f"{'size':>6} {'solver':<10}{'explored':>10}{'cost':>8}{'seconds':>10}")
+    for size in sizes:
+        filename = os.path.join(directory, f"rooms{size}.txt")
+        generate.generate("rooms", size, size, filename)
+        for solver in ("bfs", "astar", "jps"):
+            m = Maze(filename)
+            m.solve(solver)
+            print(f"{size:>6} {solver:<10}{m.num_explored:>10}{m.solution_cost:>8}"
+                  f"{m.solve_time:>10.3f}")
+
+
+def peak_rss():
+    """
+    Returns this process's peak resident set size in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(task):
+    """
+    Loads and solves one maze, returning a report row. Run in a
+    fresh process: ru_maxrss is the peak over the process lifetime.
+    """
+    filename, solver = task
+    start = time.perf_counter()
+    m = Maze(filename)
+    loaded = time.perf_counter() - start
+    try:
+        m.solve(solver)
+        explored, cost = m.num_explored, m.solution_cost
+    except Exception:
+        explored, cost = None, None
+    return {
+        "explored": explored,
+        "cost": cost,
+        "load_seconds": round(loaded, 6),
+        "solve_seconds": round(m.solve_time, 6),
+        "peak_rss_mb": round(peak_rss() / (1 << 20), 1)
+    }
+
+
+def report(output, directory, sizes):
+    """
+    Runs every solver on every layout and size and writes the
+    results to `output`, as JSON if it ends in .json, else CSV.
+    """
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    for layout in generate.LAYOUTS:
+        for size in sizes:
+            filename = os.path.join(directory, f"{layout}{size}.txt")
+            generate.generate(layout, size, size, filename)
+            for solver in SOLVERS:
+                with context.Pool(1) as pool:
+                    row = {"layout": layout, "size": size, "solver": solver}
+                    row.update(pool.apply(measure, ((filename, solver),)))
+                rows.append(row)
+                explored = row["explored"] if row["explored"] is not None else "none"
+                print(f"{layout:<12}{size:>6} {solver:<10}{explored:>10}"
+                      f"{row['solve_seconds']:>10.3f}{row['peak_rss_mb']:>9.1f} MB",
+                      file=sys.stderr)
+            os.remove(filename)
+
+    with open(output, "w", newline="") as f:
+        if output.endswith(".json"):
+            json.dump(rows, f, indent=2)
+        else:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main():
+    if len(sys.argv) >= 3 and sys.argv[1] == "report":
+        sizes = [int(size) for size in sys.argv[3:]] or SIZES
+        with tempfile.TemporaryDirectory() as directory:
+            report(sys.argv[2], directory, sizes)
+        return
+
+    commands = {
+        "frontiers": compare_frontiers,
+        "solvers": compare_solvers,
+        "backends": compare_backends,
+        "jumps": compare_jumps
+    }
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        sys.exit(f"Usage: python benchmark.py {'|'.join(commands)} [size ...]\n"
+                 "       python benchmark.py report output.csv|output.json [size ...]")
+    sizes = [int(size) for size in sys.argv[2:]] or SIZES
+    with tempfile.TemporaryDirectory() as directory:
+        commands[sys.argv[1]](directory, sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Goal distance fields for answering many start -> goal queries on
+one maze.
+
+A single reverse search from the goal B (breadth-first, or Dijkstra
+when cells have weights) gives every cell its cost to reach B. A path
+from any start then follows neighbours whose distance drops by exactly
+the cost of entering them, in time proportional to its length.
+
+Fields are cached in memory and in CACHE_DIRECTORY beside the maze
+file, keyed by a hash of the file's contents, so a maze that has not
+changed is searched only once.
+
+Usage: python distances.py maze.txt [i,j ...]
+prints the path cost from each start (A if none are given) to B.
+"""
+
+import hashlib
+import heapq
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+
+from maze import Grid, Maze
+
+CACHE_DIRECTORY = ".maze-distances"
+MAGIC = b"MAZEDST1"
+HEADER = struct.Struct("=8sIII")
+
+# Distances are stored as unsigned ints, one per padded grid cell
+DISTANCE = "I"
+UNREACHABLE = 0xFFFFFFFF
+
+# Maze file hash -> DistanceField
+fields = {}
+
+
+def file_hash(filename):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DistanceField():
+    """
+    Cost from every cell of a maze to its goal, indexed like the
+    cells of `grid`.
+    """
+
+    def __init__(self, maze, grid, distances):
+        self.maze = maze
+        self.grid = grid
+        self.distances = distances
+        self.weights = {grid.cell(i, j): weight for (i, j), weight in maze.weights.items()}
+
+    @classmethod
+    def build(cls, maze):
+        grid = maze.grid
+        if grid is None:
+            grid = Grid.from_walls(maze.walls, maze.height, maze.width)
+        field = cls(maze, grid, array(DISTANCE, [UNREACHABLE]) * len(grid.open))
+        field.search()
+        return field
+
+    def search(self):
+        """
+        Fills in the distances from the goal outwards. Stepping from
+        a cell into `cell` costs the weight of `cell`, so that is what
+        each neighbour of `cell` adds to its distance.
+        """
+        is_open = self.grid.open
+        offsets = [offset for _, offset in self.grid.moves]
+        distances = self.distances
+        goal = self.grid.cell(*self.maze.goal)
+        distances[goal] = 0
+
+        if not self.weights:
+            queue = deque([goal])
+            while queue:
+                cell = queue.popleft()
+                distance = distances[cell] + 1
+                for offset in offsets:
+                    neighbor = cell + offset
+                    if is_open[neighbor] and distances[neighbor] == UNREACHABLE:
+                        distances[neighbor] = distance
+                        queue.append(neighbor)
+            return
+
+        heap = [(0, goal)]
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if distance > distances[cell]:
+                continue
+            distance += self.weights.get(cell, 1)
+            for offset in offsets:
+                neighbor = cell + offset
+                if is_open[neighbor] and distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    heapq.heappush(heap, (distance, neighbor))
+
+    def cell(self, start):
+        i, j = start
+        if not (0 <= i < self.maze.height and 0 <= j < self.maze.width):
+            raise ValueError(f"start {start} is outside the maze")
+        return self.grid.cell(i, j)
+
+    def distance(self, start):
+        """
+        Returns the cost from `start` to the goal, or None if the goal
+        cannot be reached from it.
+        """
+        distance = self.distances[self.cell(start)]
+        return None if distance == UNREACHABLE else distance
+
+    def path(self, start):
+        """
+        Returns the (actions, cells) solution from `start`, in the
+        form of Maze.solution, or None if the goal cannot be reached.
+        """
+        cell = self.cell(start)
+        distances = self.distances
+        if distances[cell] == UNREACHABLE:
+            return None
+        actions = []
+        cells = []
+        while distances[cell] != 0:
+            for action, offset in self.grid.moves:
+                neighbor = cell + offset
+                if distances[neighbor] != UNREACHABLE and \
+                        distances[neighbor] + self.weights.get(neighbor, 1) == distances[cell]:
+                    break
+            actions.append(action)
+            cells.append(self.grid.position(neighbor))
+            cell = neighbor
+        return (actions, cells)
+
+    def paths(self, starts):
+        """
+        Returns path(start) for each of `starts`.
+        """
+        return [self.path(start) for start in starts]
+
+    def save(self, filename):
+        """
+        Writes the field beside `filename` and renames it into place,
+        so processes sharing the cache never load half a field.
+        """
+        temporary = f"{filename}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as f:
+                f.write(HEADER.pack(MAGIC, self.maze.height, self.maze.width, len(self.distances)))
+                self.distances.tofile(f)
+            os.replace(temporary, filename)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls, maze, filename):
+        """
+        Returns the field saved in `filename`, or None if it does not
+        fit `maze`.
+        """
+        grid = maze.grid
+        if grid is None:
+            grid = Grid.from_walls(maze.walls, maze.height, maze.width)
+        with open(filename, "rb") as f:
+            magic, height, width, count = HEADER.unpack(f.read(HEADER.size))
+            if (magic, height, width, count) != (MAGIC, maze.height, maze.width, len(grid.open)):
+                return None
+            distances = array(DISTANCE)
+            distances.fromfile(f, count)
+        return cls(maze, grid, distances)
+
+
+def load_or_build(maze, directory=None):
+    """
+    Returns the distance field of a Maze loaded from a file, from the
+    in-memory or on-disk cache when the file is unchanged. Fields are
+    saved in `directory`, by default CACHE_DIRECTORY beside the maze;
+    if that cannot be written, the field is only cached in memory.
+    """
+    key = file_hash(maze.filename)
+    if key in fields:
+        return fields[key]
+
+    if directory is None:
+        directory = os.path.join(os.path.dirname(maze.filename), CACHE_DIRECTORY)
+    filename = os.path.join(directory, f"{key}.dist")
+    field = None
+    if os.path.exists(filename):
+        try:
+            field = DistanceField.load(maze, filename)
+        except (OSError, EOFError, struct.error):
+            field = None
+    if field is None:
+        field = DistanceField.build(maze)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            field.save(filename)
+        except OSError:
+            pass
+    fields[key] = field
+    return field
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python distances.py maze.txt [i,j ...]")
+    m = Maze(sys.argv[1])
+    starts = [tuple(int(x) for x in arg.split(",")) for arg in sys.argv[2:]] or [m.start]
+    field = m.distance_field()
+    for start, path in zip(starts, field.paths(starts)):
+        if path is None:
+            print(f"{start}: no solution")
+        else:
+            print(f"{start}: cost {field.distance(start)}, {len(path[1])} steps")
+
+
+if __name__ == "__main__":
+    main()
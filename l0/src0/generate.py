@@ -0,0 +1,177 @@
+"""
+Generates mazes in the text format read by maze.Maze.
+
+Layouts:
+    backtracker  a perfect maze carved by a randomized depth-first
+                 search: long winding corridors, one path between
+                 any two cells.
+    prim         a perfect maze grown by randomized Prim's algorithm:
+                 short dead ends branching off everywhere.
+    rooms        open rectangular rooms in a grid, each joined to its
+                 right and lower neighbours by a one-cell door.
+
+Grids are bytearrays of height x width cells (1 = wall) indexed by
+i * width + j, and are written out row by row, so 10k x 10k mazes fit
+in about 100 MB.
+
+Usage: python generate.py backtracker|prim|rooms height width output.txt [seed]
+"""
+
+import random
+import sys
+from array import array
+
+# Side of a room, walls included, in the rooms layout
+ROOM_SIZE = 16
+
+# Byte per grid value: walls, open cells, and Prim's unvisited frontier
+CHARACTERS = bytes.maketrans(b"\x00\x01\x02", b" ##")
+
+
+def last_cell(n):
+    """
+    Returns the largest odd index below n - 1, the last cell of a
+    row or column in the perfect-maze layouts.
+    """
+    return n - 2 if n % 2 == 1 else n - 3
+
+
+def steps(cell, height, width):
+    """
+    Returns the offsets to the cells two steps away from `cell` in
+    each direction that stay inside the outer wall.
+    """
+    i, j = divmod(cell, width)
+    offsets = []
+    if i >= 3:
+        offsets.append(-width)
+    if i + 2 <= last_cell(height):
+        offsets.append(width)
+    if j >= 3:
+        offsets.append(-1)
+    if j + 2 <= last_cell(width):
+        offsets.append(1)
+    return offsets
+
+
+def backtracker(height, width, rng):
+    """
+    Returns (grid, start, goal) for a perfect maze carved by a
+    randomized depth-first search from the top-left cell.
+    """
+    grid = bytearray(b"\x01") * (height * width)
+    start = width + 1
+    grid[start] = 0
+    stack = array("I", [start])
+    while stack:
+        cell = stack[-1]
+        options = [offset for offset in steps(cell, height, width)
+                   if grid[cell + 2 * offset]]
+        if not options:
+            stack.pop()
+            continue
+        offset = rng.choice(options)
+        grid[cell + offset] = 0
+        grid[cell + 2 * offset] = 0
+        stack.append(cell + 2 * offset)
+    return grid, (1, 1), (last_cell(height), last_cell(width))
+
+
+def prim(height, width, rng):
+    """
+    Returns (grid, start, goal) for a perfect maze grown by randomized
+    Prim's algorithm: a random frontier cell is joined to a random
+    carved neighbour until no frontier is left.
+    """
+    grid = bytearray(b"\x01") * (height * width)
+    frontier = array("I")
+
+    def carve(cell):
+        grid[cell] = 0
+        for offset in steps(cell, height, width):
+            if grid[cell + 2 * offset] == 1:
+                grid[cell + 2 * offset] = 2
+                frontier.append(cell + 2 * offset)
+
+    carve(width + 1)
+    while frontier:
+        # Swap-remove a random frontier cell
+        k = rng.randrange(len(frontier))
+        cell = frontier[k]
+        frontier[k] = frontier[-1]
+        frontier.pop()
+        offset = rng.choice([offset for offset in steps(cell, height, width)
+                             if grid[cell + 2 * offset] == 0])
+        grid[cell + offset] = 0
+        carve(cell)
+    return grid, (1, 1), (last_cell(height), last_cell(width))
+
+
+def wall_lines(n, size):
+    """
+    Returns the indices of the walls between rooms along one axis,
+    outer walls included, leaving at least one open line between
+    any two of them.
+    """
+    return list(range(0, n - 2, size)) + [n - 1]
+
+
+def rooms(height, width, rng, size=ROOM_SIZE):
+    """
+    Returns (grid, start, goal) for a grid of open rooms of side
+    `size`, each with a door to the room on its right and below.
+    """
+    rows = wall_lines(height, size)
+    cols = wall_lines(width, size)
+    grid = bytearray(height * width)
+    for i in rows:
+        grid[i * width:(i + 1) * width] = b"\x01" * width
+    for j in cols:
+        grid[j::width] = b"\x01" * height
+
+    for top, bottom in zip(rows, rows[1:]):
+        for j in cols[1:-1]:
+            grid[rng.randrange(top + 1, bottom) * width + j] = 0
+    for left, right in zip(cols, cols[1:]):
+        for i in rows[1:-1]:
+            grid[i * width + rng.randrange(left + 1, right)] = 0
+    return grid, (1, 1), (height - 2, width - 2)
+
+
+LAYOUTS = {
+    "backtracker": backtracker,
+    "prim": prim,
+    "rooms": rooms,
+}
+
+
+def generate(layout, height, width, filename, seed=0):
+    """
+    Writes a `layout` maze of height x width cells to `filename`.
+    """
+    if height < 3 or width < 3:
+        raise ValueError("mazes must be at least 3 x 3")
+    grid, start, goal = LAYOUTS[layout](height, width, random.Random(seed))
+    if start == goal:
+        raise ValueError(f"{height} x {width} is too small for distinct start and goal")
+    with open(filename, "wb") as f:
+        for i in range(height):
+            row = bytearray(grid[i * width:(i + 1) * width].translate(CHARACTERS))
+            if i == start[0]:
+                row[start[1]] = ord("A")
+            if i == goal[0]:
+                row[goal[1]] = ord("B")
+            row.append(ord("\n"))
+            f.write(row)
+
+
+def main():
+    if len(sys.argv) not in (5, 6) or sys.argv[1] not in LAYOUTS:
+        sys.exit(f"Usage: python generate.py {'|'.join(LAYOUTS)} height width output.txt [seed]")
+    layout, height, width, filename = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+    seed = int(sys.argv[5]) if len(sys.argv) == 6 else 0
+    generate(layout, height, width, filename, seed)
+
+
+if __name__ == "__main__":
+    main()
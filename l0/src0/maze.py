@@ -1,21 +1,36 @@
+import glob
+import heapq
+import json
+import os
+import re
+import struct
 import sys
+import time
+import tracemalloc
+import zlib
+from collections import deque
+from multiprocessing import Pool
 
 class Node():
-    def __init__(self, state, parent, action):
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
         self.action = action
+        self.cost = cost
 
 
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        # state -> number of nodes in the frontier with that state
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -24,10 +39,21 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.discard_state(node.state)
             return node
 
+    def improves(self, state, cost):
+        # Stack and queue frontiers never replace a queued node
+        return False
+
+    def discard_state(self, state):
+        count = self.states[state]
+        if count == 1:
+            del self.states[state]
+        else:
+            self.states[state] = count - 1
+
 
 class QueueFrontier(StackFrontier):
 
@@ -35,15 +61,198 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            node = self.frontier.popleft()
+            self.discard_state(node.state)
             return node
 
+
+class PriorityFrontier():
+    """
+    Heap-based frontier that removes the node with the lowest
+    `priority(node, order)`, where `order` counts additions.
+    Adding a state that is already queued replaces the old node,
+    which is then skipped when popped.
+    """
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.heap = []
+        # state -> node currently queued for that state
+        self.best = {}
+        self.order = 0
+
+    def add(self, node):
+        self.order += 1
+        heapq.heappush(self.heap, (self.priority(node, self.order), self.order, node))
+        self.best[node.state] = node
+
+    def contains_state(self, state):
+        return state in self.best
+
+    def improves(self, state, cost):
+        return cost < self.best[state].cost
+
+    def empty(self):
+        return len(self.best) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        while True:
+            _, _, node = heapq.heappop(self.heap)
+            if self.best.get(node.state) is node:
+                del self.best[node.state]
+                return node
+
+
+# Solver name -> function of a maze returning its frontier
+SOLVERS = {
+    "dfs": lambda maze: PriorityFrontier(lambda node, order: -order),
+    "bfs": lambda maze: PriorityFrontier(lambda node, order: order),
+    "greedy": lambda maze: PriorityFrontier(lambda node, order: maze.distance(node.state)),
+    "astar": lambda maze: PriorityFrontier(lambda node, order: node.cost + maze.distance(node.state)),
+    "dijkstra": lambda maze: PriorityFrontier(lambda node, order: node.cost),
+    # A* over jump points only; see Maze.search_jumps
+    "jps": lambda maze: PriorityFrontier(lambda node, order: node.cost + maze.distance(node.state)),
+}
+
+# Mazes with at least this many cells use the compact Grid backend
+COMPACT_CELLS = 250000
+
+# Byte per character of an ASCII line: 1 for open cells, 0 for walls
+OPEN_CELLS = bytes(1 if chr(c) in " AB123456789" else 0 for c in range(256))
+
+
+# Colours of output_image, by palette index
+PALETTE = [
+    (0, 0, 0),
+    (40, 40, 40),
+    (255, 0, 0),
+    (0, 171, 28),
+    (220, 235, 113),
+    (212, 97, 85),
+    (237, 240, 252),
+]
+BACKGROUND, WALL, START, GOAL, SOLUTION, EXPLORED, EMPTY = range(len(PALETTE))
+
+# Palette index per cell of a walls row (True = wall) and of Grid.open
+WALL_COLORS = bytes.maketrans(b"\x00\x01", bytes([EMPTY, WALL]))
+OPEN_COLORS = bytes.maketrans(b"\x00\x01", bytes([WALL, EMPTY]))
+
+
+class Grid():
+    """
+    Compact wall storage for large mazes: one byte per cell (1 = open)
+    in a bytearray, surrounded by a border of walls so moving off the
+    maze needs no bounds check. Cells are identified by their flat
+    index into the padded array, and neighbours are found by adding
+    the precomputed offsets in `moves`.
+
+    Indexing a Grid by row returns that row's walls as a list of
+    booleans, so it can stand in for Maze.walls.
+    """
+
+    def __init__(self, lines, height, width):
+        self.height = height
+        self.width = width
+        self.stride = width + 2
+        self.open = bytearray(self.stride * (height + 2))
+        for i, line in enumerate(lines):
+            if line.isascii():
+                row = line.encode("ascii").translate(OPEN_CELLS)
+            else:
+                row = bytes(1 if c in " AB123456789" else 0 for c in line)
+            # Cells past the end of a short line are open
+            row += b"\x01" * (width - len(row))
+            start = self.cell(i, 0)
+            self.open[start:start + width] = row
+        self.moves = (
+            ("up", -self.stride),
+            ("down", self.stride),
+            ("left", -1),
+            ("right", 1)
+        )
+
+    @classmethod
+    def from_walls(cls, walls, height, width):
+        return cls(("".join("#" if wall else " " for wall in row) for row in walls),
+                   height, width)
+
+    def cell(self, i, j):
+        return (i + 1) * self.stride + j + 1
+
+    def position(self, cell):
+        i, j = divmod(cell, self.stride)
+        return (i - 1, j - 1)
+
+    def jump(self, cell, offset, goal):
+        """
+        Moves from `cell` in the direction of `offset` until reaching
+        a jump point, which is returned, or a wall, giving None.
+
+        Horizontal runs stop at the goal or where a cell above or
+        below opens up next to a wall behind it (a forced neighbour,
+        reachable no faster any other way). Vertical runs stop at the
+        goal or where a horizontal run from the cell finds a jump point.
+        """
+        is_open = self.open
+        while True:
+            cell += offset
+            if not is_open[cell]:
+                return None
+            if cell == goal:
+                return cell
+            if offset in (-1, 1):
+                for side in (-self.stride, self.stride):
+                    if is_open[cell + side] and not is_open[cell - offset + side]:
+                        return cell
+            elif self.jump(cell, -1, goal) is not None or self.jump(cell, 1, goal) is not None:
+                return cell
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.height:
+            raise IndexError("row out of range")
+        start = self.cell(i, 0)
+        return [not cell for cell in self.open[start:start + self.width]]
+
+
+class Cells():
+    """
+    Set-like view of (i, j) positions over per-cell flags of a Grid.
+    """
+
+    def __init__(self, grid, flags):
+        self.grid = grid
+        self.flags = flags
+
+    def __contains__(self, position):
+        i, j = position
+        return 0 <= i < self.grid.height and 0 <= j < self.grid.width \
+            and self.flags[self.grid.cell(i, j)] == 1
+
+    def __iter__(self):
+        for cell, flag in enumerate(self.flags):
+            if flag:
+                yield self.grid.position(cell)
+
+    def __len__(self):
+        return self.flags.count(1)
+
+
 class Maze():
 
-    def __init__(self, filename):
+    def __init__(self, filename, compact=None):
+        """
+        Loads a maze file. With `compact`, walls are kept in a Grid
+        and searched by flat cell index; by default that happens for
+        mazes of at least COMPACT_CELLS cells.
+        """
 
         # Read file and set height and width of maze
+        self.filename = filename
         with open(filename) as f:
             contents = f.read()
 
@@ -57,8 +266,17 @@ class Maze():
         contents = contents.splitlines()
         self.height = len(contents)
         self.width = max(len(line) for line in contents)
+        if compact is None:
+            compact = self.height * self.width >= COMPACT_CELLS
+        self.grid = None
+        self.solution = None
+        if compact:
+            self.load_grid(contents)
+            return
 
-        # Keep track of walls
+        # Keep track of walls, and of the cost of entering cells marked
+        # with a digit (every other open cell costs 1)
+        self.weights = {}
         self.walls = []
         for i in range(self.height):
             row = []
@@ -72,13 +290,34 @@ class Maze():
                         row.append(False)
                     elif contents[i][j] == " ":
                         row.append(False)
+                    elif contents[i][j] in "123456789":
+                        self.weights[(i, j)] = int(contents[i][j])
+                        row.append(False)
                     else:
                         row.append(True)
                 except IndexError:
                     row.append(False)
             self.walls.append(row)
 
-        self.solution = None
+
+    def load_grid(self, contents):
+        self.grid = Grid(contents, self.height, self.width)
+        self.walls = self.grid
+
+        # Weights by position for print, and by cell for the search
+        self.weights = {}
+        self.grid.weights = {}
+        for i, line in enumerate(contents):
+            j = line.find("A")
+            if j != -1:
+                self.start = (i, j)
+            j = line.find("B")
+            if j != -1:
+                self.goal = (i, j)
+            for match in re.finditer("[1-9]", line):
+                j = match.start()
+                self.weights[(i, j)] = int(match.group())
+                self.grid.weights[self.grid.cell(i, j)] = int(match.group())
 
 
     def print(self):
@@ -94,6 +333,8 @@ class Maze():
                     print("B", end="")
                 elif solution is not None and (i, j) in solution:
                     print("*", end="")
+                elif (i, j) in self.weights:
+                    print(self.weights[(i, j)], end="")
                 else:
                     print(" ", end="")
             print()
@@ -116,15 +357,54 @@ class Maze():
         return result
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def cost(self, state):
+        return self.weights.get(state, 1)
+
+
+    def distance(self, state):
+        """Manhattan distance from a state to the goal."""
+        # search_grid states are flat cell indices rather than positions
+        if not isinstance(state, tuple):
+            state = self.grid.position(state)
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
+
+
+    def solve(self, solver="dfs", frontier=None, trace_memory=False):
+        """
+        Finds a solution to maze, if one exists.
+
+        `solver` names an entry of SOLVERS; a `frontier` object, if
+        given, is used instead. Sets num_explored, solve_time and,
+        with `trace_memory`, peak_memory in bytes (tracing slows the
+        search, so solve_time is then inflated).
+        """
+        self.solve_time = None
+        self.peak_memory = None
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            if solver == "jps" and frontier is None:
+                search = self.search_jumps
+            elif self.grid is None:
+                search = self.search
+            else:
+                search = self.search_grid
+            search(SOLVERS[solver](self) if frontier is None else frontier)
+        finally:
+            self.solve_time = time.perf_counter() - started
+            if trace_memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+
+    def search(self, frontier):
 
         # Keep track of number of states explored
         self.num_explored = 0
 
         # Initialize frontier to just the starting position
         start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
         frontier.add(start)
 
         # Initialize an empty explored set
@@ -143,6 +423,7 @@ class Maze():
 
             # If node is the goal, then we have a solution
             if node.state == self.goal:
+                self.solution_cost = node.cost
                 actions = []
                 cells = []
                 while node.parent is not None:
@@ -159,71 +440,329 @@ class Maze():
 
             # Add neighbors to frontier
             for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
+                if state in self.explored:
+                    continue
+                cost = node.cost + self.cost(state)
+                if not frontier.contains_state(state) or frontier.improves(state, cost):
+                    child = Node(state=state, parent=node, action=action, cost=cost)
                     frontier.add(child)
 
 
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
+    def search_grid(self, frontier):
+        """
+        search() over a Grid: states are flat cell indices and the
+        explored set is a bytearray. The solution and explored cells
+        are reported as (i, j) positions, as search() does.
+        """
+        grid = self.grid
+        is_open = grid.open
+        moves = grid.moves
+        weights = grid.weights
+        goal = grid.cell(*self.goal)
 
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
+        self.num_explored = 0
+        frontier.add(Node(state=grid.cell(*self.start), parent=None, action=None))
+        explored = bytearray(len(is_open))
+        self.explored = Cells(grid, explored)
 
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
+        while True:
+            if frontier.empty():
+                raise Exception("no solution")
 
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
+            node = frontier.remove()
+            self.num_explored += 1
 
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
+            if node.state == goal:
+                self.solution_cost = node.cost
+                actions = []
+                cells = []
+                while node.parent is not None:
+                    actions.append(node.action)
+                    cells.append(grid.position(node.state))
+                    node = node.parent
+                actions.reverse()
+                cells.reverse()
+                self.solution = (actions, cells)
+                return
 
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
+            explored[node.state] = 1
+
+            for action, offset in moves:
+                state = node.state + offset
+                if not is_open[state] or explored[state]:
+                    continue
+                cost = node.cost + weights.get(state, 1)
+                if not frontier.contains_state(state) or frontier.improves(state, cost):
+                    frontier.add(Node(state=state, parent=node, action=action, cost=cost))
+
+
+    def search_jumps(self, frontier):
+        """
+        Jump Point Search: A* on a uniform-cost maze that only queues
+        jump points. A node reached moving vertically continues
+        forward or turns left or right; one reached moving
+        horizontally continues forward, and turns only towards forced
+        neighbours. Runs of cells between jump points are filled back
+        in, so the solution lists every cell as search() does; states
+        and explored cells are (i, j) positions of jump points.
+        """
+        if self.weights:
+            raise ValueError("jump point search needs a maze without weights")
+        grid = self.grid
+        if grid is None:
+            grid = Grid.from_walls(self.walls, self.height, self.width)
+        offsets = dict(grid.moves)
+        goal = grid.cell(*self.goal)
 
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
+        self.num_explored = 0
+        frontier.add(Node(state=self.start, parent=None, action=None))
+        explored = bytearray(len(grid.open))
+        self.explored = Cells(grid, explored)
 
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
+        while True:
+            if frontier.empty():
+                raise Exception("no solution")
 
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
+            node = frontier.remove()
+            self.num_explored += 1
+            cell = grid.cell(*node.state)
+
+            if cell == goal:
+                self.solution_cost = node.cost
+                actions = []
+                cells = []
+                while node.parent is not None:
+                    offset = offsets[node.action]
+                    start = grid.cell(*node.parent.state)
+                    for step in range(grid.cell(*node.state), start, -offset):
+                        actions.append(node.action)
+                        cells.append(grid.position(step))
+                    node = node.parent
+                actions.reverse()
+                cells.reverse()
+                self.solution = (actions, cells)
+                return
 
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
+            explored[cell] = 1
+
+            if node.action is None:
+                directions = list(offsets)
+            elif node.action in ("up", "down"):
+                directions = [node.action, "left", "right"]
+            else:
+                directions = [node.action]
+                behind = cell - offsets[node.action]
+                for side in ("up", "down"):
+                    if grid.open[cell + offsets[side]] and not grid.open[behind + offsets[side]]:
+                        directions.append(side)
+
+            for action in directions:
+                offset = offsets[action]
+                point = grid.jump(cell, offset, goal)
+                if point is None or explored[point]:
+                    continue
+                state = grid.position(point)
+                cost = node.cost + (point - cell) // offset
+                if not frontier.contains_state(state) or frontier.improves(state, cost):
+                    frontier.add(Node(state=state, parent=node, action=action, cost=cost))
+
+
+    def distance_field(self):
+        """
+        Returns the distances.DistanceField to this maze's goal, for
+        answering paths from many starts; it is computed once per
+        maze file and cached.
+        """
+        import distances
+        return distances.load_or_build(self)
+
+
+    def color_rows(self, show_solution=True, show_explored=False):
+        """
+        Yields one bytearray per maze row holding each cell's index
+        into PALETTE.
+        """
+        solution = {}
+        if self.solution is not None and show_solution:
+            for i, j in self.solution[1]:
+                solution.setdefault(i, []).append(j)
+        show_explored = self.solution is not None and show_explored
+        explored = {}
+        if show_explored and self.grid is None:
+            for i, j in self.explored:
+                explored.setdefault(i, []).append(j)
 
+        for i in range(self.height):
+            if self.grid is None:
+                row = bytearray(bytes(self.walls[i]).translate(WALL_COLORS))
+                for j in explored.get(i, ()):
+                    row[j] = EXPLORED
+            else:
+                first = self.grid.cell(i, 0)
+                row = bytearray(self.grid.open[first:first + self.width].translate(OPEN_COLORS))
+                if show_explored:
+                    flags = self.explored.flags[first:first + self.width]
+                    j = flags.find(1)
+                    while j != -1:
+                        row[j] = EXPLORED
+                        j = flags.find(1, j + 1)
+            for j in solution.get(i, ()):
+                row[j] = SOLUTION
+            if i == self.start[0]:
+                row[self.start[1]] = START
+            if i == self.goal[0]:
+                row[self.goal[1]] = GOAL
+            yield row
+
+
+    def pixel_rows(self, cell_size, cell_border, show_solution=True, show_explored=False):
+        """
+        Yields (scanline, repeat) pairs covering the image from top to
+        bottom, one maze row at a time, with palette-index pixels.
+        """
+        # Cells fill pixels cell_border..cell_size - cell_border inclusive
+        trailing = max(cell_border - 1, 0)
+        fill = cell_size - cell_border - trailing
+        cells = [bytes([BACKGROUND]) * cell_border + bytes([color]) * fill
+                 + bytes([BACKGROUND]) * trailing for color in range(len(PALETTE))]
+        blank = bytes([BACKGROUND]) * (self.width * cell_size)
+        for row in self.color_rows(show_solution, show_explored):
+            line = b"".join([cells[color] for color in row])
+            if cell_border:
+                yield blank, cell_border
+            yield line, fill
+            if trailing:
+                yield blank, trailing
+
+
+    def output_image(self, filename, show_solution=True, show_explored=False,
+                     cell_size=50, cell_border=2):
+        """
+        Draws the maze. PNGs are written a row of cells at a time, so
+        the whole canvas is never in memory; other formats are built
+        in memory and saved with PIL.
+        """
+        size = (self.width * cell_size, self.height * cell_size)
+        rows = self.pixel_rows(cell_size, cell_border, show_solution, show_explored)
+        if filename.lower().endswith(".png"):
+            write_png(filename, size, PALETTE, rows)
+            return
+
+        from PIL import Image
+        img = Image.frombytes("P", size, b"".join(line * repeat for line, repeat in rows))
+        img.putpalette([channel for color in PALETTE for channel in color])
         img.save(filename)
 
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+def write_png(filename, size, palette, rows):
+    """
+    Writes an 8-bit palette PNG from (scanline, repeat) pairs,
+    compressing and writing as the rows arrive.
+    """
+    def chunk(f, kind, data):
+        f.write(struct.pack(">I", len(data)))
+        f.write(kind + data)
+        f.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+    with open(filename, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        chunk(f, b"IHDR", struct.pack(">IIBBBBB", size[0], size[1], 8, 3, 0, 0, 0))
+        chunk(f, b"PLTE", bytes(channel for color in palette for channel in color))
+        compressor = zlib.compressobj()
+        for line, repeat in rows:
+            # Each scanline starts with its filter type, 0 (none)
+            data = compressor.compress((b"\x00" + line) * repeat)
+            if data:
+                chunk(f, b"IDAT", data)
+        chunk(f, b"IDAT", compressor.flush())
+        chunk(f, b"IEND", b"")
+
+
+def maze_files(pattern):
+    """
+    Returns the maze files named by a directory (its *.txt files) or
+    a glob pattern, sorted.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.txt")
+    return sorted(filename for filename in glob.glob(pattern) if os.path.isfile(filename))
+
+
+def summarize(task):
+    """
+    Solves one maze file and returns a JSON-serializable summary.
+    """
+    filename, solver = task
+    summary = {"maze": filename}
+    try:
+        m = Maze(filename)
+    except Exception as e:
+        summary["error"] = str(e)
+        return summary
+    try:
+        m.solve(solver)
+        summary["solvable"] = True
+        summary["path_length"] = len(m.solution[1])
+        summary["cost"] = m.solution_cost
+    except ValueError as e:
+        summary["error"] = str(e)
+        return summary
+    except Exception:
+        summary["solvable"] = False
+        summary["path_length"] = None
+        summary["cost"] = None
+    summary["explored"] = m.num_explored
+    summary["seconds"] = round(m.solve_time, 6)
+    return summary
+
+
+def solve_batch(filenames, solver="bfs", processes=None, out=sys.stdout):
+    """
+    Solves every maze in a process pool, writing one JSON summary per
+    line to `out` in the order given. Returns the summaries.
+    """
+    tasks = [(filename, solver) for filename in filenames]
+    summaries = []
+    with Pool(processes) as pool:
+        for summary in pool.imap(summarize, tasks):
+            out.write(json.dumps(summary) + "\n")
+            summaries.append(summary)
+    return summaries
+
+
+def main():
+    usage = f"Usage: python maze.py maze.txt [{'|'.join(SOLVERS)}]\n" \
+            f"       python maze.py batch directory|glob [{'|'.join(SOLVERS)}] [processes]"
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        if len(sys.argv) not in (3, 4, 5) or (len(sys.argv) > 3 and sys.argv[3] not in SOLVERS):
+            sys.exit(usage)
+        filenames = maze_files(sys.argv[2])
+        solver = sys.argv[3] if len(sys.argv) > 3 else "bfs"
+        processes = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        started = time.perf_counter()
+        summaries = solve_batch(filenames, solver, processes)
+        seconds = time.perf_counter() - started
+        solvable = sum(1 for summary in summaries if summary.get("solvable"))
+        errors = sum(1 for summary in summaries if "error" in summary)
+        print(f"{len(summaries)} mazes in {seconds:.2f}s: {solvable} solvable, "
+              f"{len(summaries) - solvable - errors} unsolvable, {errors} invalid", file=sys.stderr)
+        return
+
+    if len(sys.argv) not in (2, 3) or (len(sys.argv) == 3 and sys.argv[2] not in SOLVERS):
+        sys.exit(usage)
+
+    m = Maze(sys.argv[1])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve(sys.argv[2] if len(sys.argv) == 3 else "dfs", trace_memory=True)
+    print("States Explored:", m.num_explored)
+    print("Path Cost:", m.solution_cost)
+    print(f"Time: {m.solve_time:.3f}s, Peak Memory: {m.peak_memory / 1024:.1f} KiB")
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Bitboard Tic Tac Toe engine
+
+A state is a pair of 9-bit masks (x, o), bit 3 * i + j marking a mark
+in cell (i, j). Moves are XORs into the mover's mask, the player to
+move follows from the parity of the number of marks, and a win is a
+lookup of a mask in a table of every mask that covers a line.
+
+The functions mirror tictactoe.py; from_board and to_board convert
+to and from its list boards.
+"""
+
+import tictactoe
+
+FULL = 0b111111111
+
+# The 8 lines: rows, columns and diagonals
+LINES = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+]
+
+# mask -> 1 if it covers a line, and mask -> number of bits set
+WINS = bytes(any(mask & line == line for line in LINES) for mask in range(FULL + 1))
+COUNTS = bytes(bin(mask).count("1") for mask in range(FULL + 1))
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return (0, 0)
+
+
+def player(state):
+    """
+    Returns player who has the next turn on a board.
+    """
+    x, o = state
+    return tictactoe.X if COUNTS[x | o] % 2 == 0 else tictactoe.O
+
+
+def actions(state):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    taken = state[0] | state[1]
+    return {divmod(k, 3) for k in range(9) if not taken >> k & 1}
+
+
+def result(state, action):
+    """
+    Returns the state that results from making move (i, j).
+    """
+    i, j = action
+    if i not in range(0, 3) or j not in range(0, 3):
+        raise Exception("cannot play there, stick to the board boardy")
+    bit = 1 << (3 * i + j)
+    x, o = state
+    if (x | o) & bit:
+        raise Exception("cannot play there, taken")
+    if COUNTS[x | o] % 2 == 0:
+        return (x ^ bit, o)
+    return (x, o ^ bit)
+
+
+def winner(state):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = state
+    if WINS[x]:
+        return tictactoe.X
+    if WINS[o]:
+        return tictactoe.O
+    return None
+
+
+def terminal(state):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    x, o = state
+    return bool(WINS[x] or WINS[o]) or x | o == FULL
+
+
+def utility(state):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    x, o = state
+    if WINS[x]:
+        return 1
+    if WINS[o]:
+        return -1
+    return 0
+
+
+def value(x, o):
+    """
+    Returns the minimax value of a position, searching every move.
+    """
+    if WINS[x]:
+        return 1
+    if WINS[o]:
+        return -1
+    taken = x | o
+    if taken == FULL:
+        return 0
+    free = FULL ^ taken
+    if COUNTS[taken] % 2 == 0:
+        v = -2
+        while free:
+            bit = free & -free
+            free ^= bit
+            v = max(v, value(x ^ bit, o))
+        return v
+    v = 2
+    while free:
+        bit = free & -free
+        free ^= bit
+        v = min(v, value(x, o ^ bit))
+    return v
+
+
+def minimax(state):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    if terminal(state):
+        return None
+    maximizing = player(state) == tictactoe.X
+    bestValue = None
+    bestAction = None
+    for k in range(9):
+        if (state[0] | state[1]) >> k & 1:
+            continue
+        x, o = result(state, divmod(k, 3))
+        v = value(x, o)
+        if bestValue is None or (v > bestValue if maximizing else v < bestValue):
+            bestValue = v
+            bestAction = divmod(k, 3)
+    return bestAction
+
+
+def from_board(board):
+    """
+    Returns the state of a tictactoe.py list board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == tictactoe.X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == tictactoe.O:
+                o |= 1 << (3 * i + j)
+    return (x, o)
+
+
+def to_board(state):
+    """
+    Returns the tictactoe.py list board of a state.
+    """
+    x, o = state
+    return [[tictactoe.X if x >> (3 * i + j) & 1 else tictactoe.O if o >> (3 * i + j) & 1
+             else tictactoe.EMPTY for j in range(3)] for i in range(3)]
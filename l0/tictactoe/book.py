@@ -0,0 +1,157 @@
+"""
+Perfect-play table for 3 x 3 Tic Tac Toe.
+
+Every reachable position is solved once and written to BOOK_FILE: a
+short header, then one byte per possible board, indexed by reading
+the board as a base-3 number (cell 3 * i + j is digit 3 * i + j,
+EMPTY = 0, X = 1, O = 2). A byte holds the best move's cell in its
+low 4 bits and the minimax value + 1 in the next 2; unreachable and
+finished positions hold NONE. The file is memory-mapped, so a lookup
+is one index computation and one byte read, and processes serving
+many games share one copy of it.
+
+Usage: python book.py
+builds the table.
+"""
+
+import mmap
+import os
+import sys
+
+import tictactoe as ttt
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe.book")
+MAGIC = b"TTTBOOK1"
+STATES = 3 ** 9
+NONE = 0xFF
+DIGITS = {ttt.EMPTY: 0, ttt.X: 1, ttt.O: 2}
+
+
+def index(board):
+    """
+    Returns the table index of a 3 x 3 board.
+    """
+    i = 0
+    for row in reversed(board):
+        for cell in reversed(row):
+            i = 3 * i + DIGITS[cell]
+    return i
+
+
+def solve(board, entries):
+    """
+    Returns the minimax value of the board, recording the best move
+    and value of it and every position reachable from it in
+    `entries`. Ties go to the earliest move in tictactoe.ORDER.
+    """
+    if ttt.terminal(board):
+        return ttt.utility(board)
+    i = index(board)
+    if entries[i] != NONE:
+        return (entries[i] >> 4) - 1
+    maximizing = ttt.player(board) == ttt.X
+    bestValue = None
+    bestAction = None
+    for action in ttt.orderedActions(board):
+        v = solve(ttt.result(board, action), entries)
+        if bestValue is None or (v > bestValue if maximizing else v < bestValue):
+            bestValue = v
+            bestAction = action
+    entries[i] = (bestValue + 1) << 4 | (3 * bestAction[0] + bestAction[1])
+    return bestValue
+
+
+def table():
+    """
+    Solves every reachable position. Returns the table's entries.
+    """
+    entries = bytearray([NONE]) * STATES
+    solve(ttt.initial_state(), entries)
+    return entries
+
+
+def write(entries, filename=BOOK_FILE):
+    """
+    Writes the header and `entries` to a temporary file and renames
+    it over `filename`. If that fails, the temporary file is removed
+    and the OSError raised.
+    """
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(MAGIC)
+            f.write(entries)
+        os.replace(temporary, filename)
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def build(filename=BOOK_FILE):
+    """
+    Solves every reachable position and writes the table. Returns the
+    number of positions with a move.
+    """
+    entries = table()
+    write(entries, filename)
+    return STATES - entries.count(NONE)
+
+
+class Book():
+    """
+    Read-only view of a table file, or of the same bytes in memory
+    when given as `data`.
+    """
+
+    def __init__(self, filename=BOOK_FILE, data=None):
+        if data is None:
+            with open(filename, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = data
+        if len(self.data) != len(MAGIC) + STATES or self.data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{filename} is not a tic-tac-toe book")
+
+    def lookup(self, board):
+        """
+        Returns (best move, minimax value) for the board, or None if
+        the game is over or the position cannot arise in play.
+        """
+        entry = self.data[len(MAGIC) + index(board)]
+        if entry == NONE:
+            return None
+        return divmod(entry & 0x0F, 3), (entry >> 4) - 1
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+
+def load_or_build(filename=BOOK_FILE):
+    """
+    Returns the Book in `filename`, building the file first if it is
+    missing or invalid. When the file cannot be created, the Book
+    reads the freshly solved entries from memory.
+    """
+    try:
+        return Book(filename)
+    except (OSError, ValueError):
+        pass
+    entries = table()
+    try:
+        write(entries, filename)
+        return Book(filename)
+    except (OSError, ValueError):
+        return Book(filename, MAGIC + entries)
+
+
+def main():
+    if len(sys.argv) != 1:
+        sys.exit("Usage: python book.py")
+    count = build()
+    print(f"Wrote {count} positions to {BOOK_FILE}")
+
+
+if __name__ == "__main__":
+    main()
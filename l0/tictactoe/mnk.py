@@ -0,0 +1,334 @@
+"""
+m,n,k-game engine: Tic Tac Toe on an m x n board won by k in a row,
+for boards where searching the whole game tree is intractable.
+
+The AI runs iterative deepening alpha-beta (negamax) within a time
+budget per move, returning the best move of the deepest search that
+finished. Positions at the depth limit are scored by a heuristic
+that counts, for each player, the k-cell windows only they occupy,
+weighting windows by how full they are. A move is checked for a win
+by walking its four lines, and positions are stored in a
+transposition table keyed by a Zobrist hash, updated with an XOR per
+move, which is kept across moves of the same game. The table is a
+fixed number of slots; a new entry displaces an old one of the same
+slot only if it was searched at least as deep or the old one is left
+over from an earlier move.
+
+Usage: python mnk.py rows cols k [seconds per move]
+plays the engine against itself and prints the game.
+"""
+
+import random
+import sys
+import time
+
+import tictactoe
+
+BUDGET = 1.0
+
+# Scores are from the point of view of the player to move. Wins are
+# worth WIN less the number of moves until them, so faster wins (and
+# slower losses) score higher; anything beyond WIN - MAX_PLY is a win.
+WIN = 1000000
+MAX_PLY = 1000
+
+# Transposition table bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Transposition table slots per engine, a power of two
+TABLE_SLOTS = 1 << 18
+
+# Boards with more cells than this only consider moves near marks
+FULL_WIDTH = 16
+NEAR = 2
+
+# Engines by (rows, cols, k), so each game keeps its table between moves
+games = {}
+
+
+class Timeout(Exception):
+    pass
+
+
+class Game():
+    """
+    Search state for one board shape: a flat list of marks, played
+    and undone in place, with its Zobrist hash.
+    """
+
+    def __init__(self, rows, cols, k, seed=0):
+        if k > max(rows, cols):
+            raise ValueError(f"{k} in a row cannot fit on a {rows} x {cols} board")
+        self.rows, self.cols, self.k = rows, cols, k
+        self.size = rows * cols
+        rng = random.Random(seed)
+        self.keys = {tictactoe.X: [rng.getrandbits(64) for _ in range(self.size)],
+                     tictactoe.O: [rng.getrandbits(64) for _ in range(self.size)]}
+        # Slot hash % TABLE_SLOTS -> (hash, depth, value, flag, best
+        # move, age of the search that stored it) or None
+        self.table = [None] * TABLE_SLOTS
+        self.age = 0
+
+        # Every k-cell window along a row, column or diagonal
+        self.windows = []
+        for i in range(rows):
+            for j in range(cols):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + (k - 1) * di, j + (k - 1) * dj
+                    if 0 <= end_i < rows and 0 <= end_j < cols:
+                        self.windows.append(tuple((i + s * di) * cols + j + s * dj
+                                                  for s in range(k)))
+        # Window score by number of marks: 10 ** marks, a full one wins
+        self.weights = [0] + [10 ** count for count in range(1, k)]
+
+        # Order moves by distance from the centre
+        centre = ((rows - 1) / 2, (cols - 1) / 2)
+        self.order = sorted(range(self.size), key=lambda cell: abs(cell // cols - centre[0])
+                            + abs(cell % cols - centre[1]))
+
+    def load(self, board):
+        """
+        Sets up the search at a list board.
+        """
+        self.cells = [mark for row in board for mark in row]
+        self.hash = 0
+        self.filled = 0
+        for cell, mark in enumerate(self.cells):
+            if mark is not tictactoe.EMPTY:
+                self.hash ^= self.keys[mark][cell]
+                self.filled += 1
+        self.mover = tictactoe.player(board)
+
+    def play(self, cell):
+        self.cells[cell] = self.mover
+        self.hash ^= self.keys[self.mover][cell]
+        self.filled += 1
+        self.mover = tictactoe.O if self.mover == tictactoe.X else tictactoe.X
+
+    def undo(self, cell):
+        self.mover = self.cells[cell]
+        self.hash ^= self.keys[self.mover][cell]
+        self.filled -= 1
+        self.cells[cell] = tictactoe.EMPTY
+
+    def wins(self, cell):
+        """
+        Returns True if the mark at `cell` completes k in a row.
+        """
+        mark = self.cells[cell]
+        i, j = divmod(cell, self.cols)
+        for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                r, c = i + sign * di, j + sign * dj
+                while 0 <= r < self.rows and 0 <= c < self.cols \
+                        and self.cells[r * self.cols + c] == mark:
+                    count += 1
+                    r, c = r + sign * di, c + sign * dj
+            if count >= self.k:
+                return True
+        return False
+
+    def evaluate(self):
+        """
+        Returns the heuristic score of the position for the mover.
+        """
+        score = 0
+        cells = self.cells
+        for window in self.windows:
+            mine = theirs = 0
+            for cell in window:
+                mark = cells[cell]
+                if mark is tictactoe.EMPTY:
+                    continue
+                if mark == self.mover:
+                    mine += 1
+                else:
+                    theirs += 1
+            if not theirs:
+                score += self.weights[mine]
+            elif not mine:
+                score -= self.weights[theirs]
+        return score
+
+    def moves(self, first=None):
+        """
+        Returns the empty cells to search, `first` (the stored best
+        move) leading. On large boards only cells within NEAR of a
+        mark are considered.
+        """
+        cells = self.cells
+        if self.size <= FULL_WIDTH or self.filled == 0:
+            candidates = [cell for cell in self.order if cells[cell] is tictactoe.EMPTY]
+            if self.filled == 0 and self.size > FULL_WIDTH:
+                candidates = candidates[:1]
+        else:
+            near = set()
+            for cell, mark in enumerate(cells):
+                if mark is tictactoe.EMPTY:
+                    continue
+                i, j = divmod(cell, self.cols)
+                for r in range(max(0, i - NEAR), min(self.rows, i + NEAR + 1)):
+                    for c in range(max(0, j - NEAR), min(self.cols, j + NEAR + 1)):
+                        near.add(r * self.cols + c)
+            candidates = [cell for cell in self.order
+                          if cell in near and cells[cell] is tictactoe.EMPTY]
+        if first is not None and first in candidates:
+            candidates.remove(first)
+            candidates.insert(0, first)
+        return candidates
+
+    def search(self, depth, alpha, beta, ply):
+        """
+        Returns the negamax value of the position searched `depth`
+        moves deep, within the (alpha, beta) window.
+        """
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise Timeout()
+
+        original = alpha
+        best_move = None
+        entry = self.probe()
+        if entry is not None:
+            _, entry_depth, value, flag, best_move, _ = entry
+            value = from_table(value, ply)
+            # At the root only the move is used: a narrowed window
+            # there could leave no reliable best move
+            if entry_depth >= depth and ply > 1:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        if depth == 0:
+            return self.evaluate()
+
+        best = -WIN - 1
+        for cell in self.moves(best_move):
+            self.play(cell)
+            if self.wins(cell):
+                value = WIN - ply
+            elif self.filled == self.size:
+                value = 0
+            else:
+                value = -self.search(depth - 1, -beta, -alpha, ply + 1)
+            self.undo(cell)
+            if value > best:
+                best, best_move = value, cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = UPPER if best <= original else LOWER if best >= beta else EXACT
+        self.store(depth, to_table(best, ply), flag, best_move)
+        return best
+
+    def probe(self):
+        """
+        Returns the table entry of the current position, or None.
+        """
+        entry = self.table[self.hash & (TABLE_SLOTS - 1)]
+        if entry is not None and entry[0] == self.hash:
+            return entry
+        return None
+
+    def store(self, depth, value, flag, best_move):
+        """
+        Records a search result for the current position, unless its
+        slot holds another position searched deeper during this move.
+        """
+        slot = self.hash & (TABLE_SLOTS - 1)
+        entry = self.table[slot]
+        if entry is None or entry[0] == self.hash or entry[5] != self.age or entry[1] <= depth:
+            self.table[slot] = (self.hash, depth, value, flag, best_move, self.age)
+
+    def best_move(self, board, budget=BUDGET, stats=None):
+        """
+        Returns the best move (i, j) found for the player to move by
+        deepening the search until `budget` seconds have passed, the
+        result is decided, or the whole game has been searched.
+        """
+        self.load(board)
+        self.age += 1
+        self.deadline = time.perf_counter() + budget
+        self.nodes = 0
+        self.depth = 0
+        best = self.moves()[0]
+        empty = self.size - self.filled
+        for depth in range(1, empty + 1):
+            try:
+                value = self.search(depth, -WIN - 1, WIN + 1, 1)
+            except Timeout:
+                # Undo the moves of the abandoned search
+                self.load(board)
+                break
+            best = self.probe()[4]
+            self.depth = depth
+            if abs(value) > WIN - MAX_PLY:
+                break
+        if stats is not None:
+            stats.nodes += self.nodes
+        return divmod(best, self.cols)
+
+
+def to_table(value, ply):
+    # Store win scores relative to the position, not the search root
+    if value > WIN - MAX_PLY:
+        return value + ply
+    if value < -WIN + MAX_PLY:
+        return value - ply
+    return value
+
+
+def from_table(value, ply):
+    if value > WIN - MAX_PLY:
+        return value - ply
+    if value < -WIN + MAX_PLY:
+        return value + ply
+    return value
+
+
+def game(rows, cols, k):
+    """
+    Returns the engine for a board shape, creating it once.
+    """
+    if (rows, cols, k) not in games:
+        games[(rows, cols, k)] = Game(rows, cols, k)
+    return games[(rows, cols, k)]
+
+
+def best_move(board, k, budget=BUDGET, stats=None):
+    """
+    Returns the engine's move for the player to move on a list board,
+    or None if the game is over.
+    """
+    if tictactoe.terminal(board, k):
+        return None
+    return game(len(board), len(board[0]), k).best_move(board, budget, stats)
+
+
+def main():
+    if len(sys.argv) not in (4, 5):
+        sys.exit("Usage: python mnk.py rows cols k [seconds per move]")
+    rows, cols, k = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3])
+    budget = float(sys.argv[4]) if len(sys.argv) == 5 else BUDGET
+    board = tictactoe.initial_state(rows, cols)
+    engine = game(rows, cols, k)
+    while not tictactoe.terminal(board, k):
+        started = time.perf_counter()
+        move = engine.best_move(board, budget)
+        print(f"{tictactoe.player(board)} plays {move} (depth {engine.depth}, "
+              f"{engine.nodes} nodes, {time.perf_counter() - started:.2f}s)")
+        board = tictactoe.result(board, move)
+    for row in board:
+        print(" ".join(mark or "." for mark in row))
+    w = tictactoe.winner(board, k)
+    print(f"{w} wins." if w else "Tie.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Background AI move computation for the runner.
+
+A MoveProvider searches for the computer's move in a worker process
+(or thread) so the game loop can keep drawing. The loop requests a
+move, polls for it every frame, and cancels the request when the game
+is reset. A search that is already running cannot be interrupted, so
+cancelling leaves it to finish in its old worker and starts a new
+worker for the next request.
+"""
+
+import logging
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import tictactoe as ttt
+
+logger = logging.getLogger(__name__)
+
+# Times a search is resubmitted after its worker died
+MAX_RETRIES = 2
+
+
+def compute(board, mode):
+    """
+    Returns (move, seconds spent searching) for the player to move.
+    """
+    started = time.perf_counter()
+    move = ttt.minimax(board, mode)
+    return move, time.perf_counter() - started
+
+
+class MoveProvider():
+
+    def __init__(self, mode="memo", processes=True):
+        """
+        Searches with minimax `mode` in a worker process, or in a
+        thread if `processes` is False. A thread starts faster but
+        shares the interpreter lock with the game loop.
+        """
+        self.mode = mode
+        self.make_executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self.executor = self.make_executor(max_workers=1)
+        self.future = None
+        self.board = None
+        self.requested = None
+        self.retries = 0
+
+    def pending(self):
+        """
+        Returns True if a move has been requested and not yet taken.
+        """
+        return self.future is not None
+
+    def request(self, board):
+        """
+        Starts searching for the move on `board`, replacing any
+        request in progress.
+        """
+        self.cancel()
+        self.board = [row[:] for row in board]
+        self.requested = time.perf_counter()
+        self.retries = 0
+        self.future = self.executor.submit(compute, self.board, self.mode)
+
+    def poll(self):
+        """
+        Returns the requested move once it is ready, else None. If
+        the worker died (a BrokenProcessPool), the search is resubmitted
+        to a fresh one up to MAX_RETRIES times. Any other error the
+        search raised, or a worker that keeps dying, is raised here so
+        the caller can report it.
+        """
+        if self.future is None or not self.future.done():
+            return None
+        future, self.future = self.future, None
+        try:
+            move, seconds = future.result()
+        except BrokenExecutor:
+            # A broken pool accepts no more work, so replace it either way
+            self.executor.shutdown(wait=False)
+            self.executor = self.make_executor(max_workers=1)
+            if self.retries >= MAX_RETRIES:
+                logger.exception("%s move failed after %d retries", self.mode, self.retries)
+                raise
+            self.retries += 1
+            logger.warning("%s worker died, requesting the move again", self.mode)
+            self.future = self.executor.submit(compute, self.board, self.mode)
+            return None
+        except Exception:
+            logger.exception("%s move failed", self.mode)
+            raise
+        logger.info("%s move %s: searched %.1f ms, latency %.1f ms", self.mode, move,
+                    1000 * seconds, 1000 * (time.perf_counter() - self.requested))
+        return move
+
+    def cancel(self):
+        """
+        Forgets the request in progress, if any.
+        """
+        if self.future is not None:
+            if not self.future.cancel():
+                logger.info("%s move cancelled after %.1f ms", self.mode,
+                            1000 * (time.perf_counter() - self.requested))
+                self.executor.shutdown(wait=False)
+                self.executor = self.make_executor(max_workers=1)
+            self.future = None
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -2,20 +2,44 @@
 Tic Tac Toe Player
 """
 
+import json
 import math
+import os
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Each of the 8 symmetries of the board (rotations and reflections)
+# as the flat cell (3 * i + j) that lands at each position
+SYMMETRIES = [
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),
+]
 
-def initial_state():
+# Moves in the order alpha-beta tries them: centre, corners, edges
+ORDER = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2), (0, 1), (1, 0), (1, 2), (2, 1)]
+
+# Transposition table saved between runs, shared by every process
+# that loads it: canonical board -> minimax value
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "minimax.json")
+table = None
+
+# Perfect-play table for mode "book", mapped on first use
+book = None
+
+
+def initial_state(rows=3, cols=3):
     """
     Returns starting state of the board.
     """
-    return [[EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY]]
+    return [[EMPTY] * cols for _ in range(rows)]
 
 
 def player(board):
@@ -40,8 +64,8 @@ def actions(board):
     Returns set of all possible actions (i, j) available on the board.
     """
     ass = set()
-    for i in range(0, 3):
-        for j in range(0, 3):
+    for i in range(len(board)):
+        for j in range(len(board[i])):
             if board[i][j]==EMPTY:
                 ass.add((i, j))
     return ass
@@ -51,24 +75,23 @@ def result(board, action):
     """
     Returns the board that results from making move (i, j) on the board.
     """
-    if action[0] not in range(0,3) or action[1] not in range(0, 3):
+    if action[0] not in range(0, len(board)) or action[1] not in range(0, len(board[0])):
         raise Exception("cannot play there, stick to the board boardy")
     if board[action[0]][action[1]] != EMPTY:
         raise Exception("cannot play there, taken")
-    newBoard = [[EMPTY, EMPTY, EMPTY],
-        [EMPTY, EMPTY, EMPTY],
-        [EMPTY, EMPTY, EMPTY]]
-    for i in range(0, 3):
-        for j in range(0, 3):
-            newBoard[i][j] = board[i][j]
+    newBoard = [row[:] for row in board]
     newBoard[action[0]][action[1]] = player(newBoard)
     return newBoard
 
 
-def winner(board):
+def winner(board, k=3):
     """
-    Returns the winner of the game, if there is one.
-    """    
+    Returns the winner of the game, if there is one: the player with
+    k marks in a row, column or diagonal.
+    """
+    if k != 3 or len(board) != 3 or len(board[0]) != 3:
+        return lineWinner(board, k)
+
     for i in range(0,3):
         if board[0][i] != EMPTY and board[0][i]==board[1][i]==board[2][i]:
             return board[0][i] 
@@ -83,68 +106,249 @@ def winner(board):
     return None
 
 
+def lineWinner(board, k):
+    """
+    Returns the player with k in a row on a board of any size.
+    """
+    rows, cols = len(board), len(board[0])
+    for i in range(rows):
+        for j in range(cols):
+            mark = board[i][j]
+            if mark == EMPTY:
+                continue
+            for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_i, end_j = i + (k - 1) * di, j + (k - 1) * dj
+                if not (0 <= end_i < rows and 0 <= end_j < cols):
+                    continue
+                if all(board[i + step * di][j + step * dj] == mark for step in range(1, k)):
+                    return mark
+    return None
+
 
-def terminal(board):
+def terminal(board, k=3):
     """
     Returns True if game is over, False otherwise.
     """
-    if winner(board) is not None:
+    if winner(board, k) is not None:
         return True
-    for i in range(0, 3):
-        for j in range(0, 3):
-            if board[i][j] is EMPTY:
+    for row in board:
+        for cell in row:
+            if cell is EMPTY:
                 return False
     return True
 
 
-def utility(board):
+def utility(board, k=3):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    w = winner(board)
+    w = winner(board, k)
     if X == w: return 1
     if O == w: return -1 
     return 0
 
 
-def minimax(board):
+class SearchStats():
+    """
+    Counts the positions a search evaluates.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+
+    def __repr__(self):
+        return f"SearchStats(nodes={self.nodes})"
+
+
+def orderedActions(board):
+    """
+    Returns the available actions in ORDER.
+    """
+    return [(i, j) for i, j in ORDER if board[i][j] == EMPTY]
+
+
+def canonical(board):
+    """
+    Returns a string key for the board that is the same for all of
+    its rotations and reflections, which share a minimax value.
+    """
+    cells = "".join(cell or "." for row in board for cell in row)
+    return min("".join(cells[k] for k in symmetry) for symmetry in SYMMETRIES)
+
+
+def load_table(filename=TABLE_FILE):
+    """
+    Loads the transposition table saved by save_table, or starts an
+    empty one.
+    """
+    global table
+    try:
+        with open(filename) as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        table = {}
+    return table
+
+
+def save_table(filename=TABLE_FILE):
+    """
+    Saves the transposition table. The file is replaced atomically,
+    so other processes never read a partly written table. Returns
+    whether it was saved: on a failed write the temporary file is
+    removed and memo searches go on with the table in memory.
+    """
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "w") as f:
+            json.dump(table, f, separators=(",", ":"))
+        os.replace(temporary, filename)
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        return False
+    return True
+
+
+def minimax(board, mode="memo", stats=None, k=3, budget=None):
     """
     Returns the optimal action for the current player on the board.
+
+    mode "plain" searches the whole game tree; "memo" looks values up
+    in the transposition table, searching and saving only positions
+    it has not seen; "alphabeta" prunes with alpha-beta search;
+    "bitboard" searches the whole tree with the bitboard engine;
+    "book" reads the move from the precomputed table in book.py;
+    "deepening" runs the mnk engine's iterative deepening search for
+    `budget` seconds, and is the only mode for boards other than 3 x 3
+    or for k other than 3.
+    A SearchStats passed as `stats` counts the positions evaluated
+    by the list-board modes.
     """
-    if terminal(board):
+    if terminal(board, k):
         return None
+    if mode == "deepening" or k != 3 or len(board) != 3 or len(board[0]) != 3:
+        import mnk
+        return mnk.best_move(board, k, budget or mnk.BUDGET, stats)
+    if mode == "book":
+        global book
+        if book is None:
+            import book as books
+            book = books.load_or_build()
+        return book.lookup(board)[0]
+    if mode == "bitboard":
+        import bitboard
+        return bitboard.minimax(bitboard.from_board(board))
+    if mode == "alphabeta":
+        return alphaBetaAction(board, stats)
+    memo = None
+    if mode == "memo":
+        memo = table if table is not None else load_table()
+        known = len(memo)
+    elif mode != "plain":
+        raise ValueError(f"unknown minimax mode: {mode}")
+
     currPlayer = player(board)
     v = -2
     bestAction = (0, 0)
     if currPlayer == X:
         bestValue = -2
         for action in actions(board):
-            v = minValue(result(board, action))
+            v = minValue(result(board, action), memo, stats)
             if v > bestValue:
                 bestValue = v
                 bestAction = action
     else:
         bestValue = 2
         for action in actions(board):
-            v = maxValue(result(board, action))
+            v = maxValue(result(board, action), memo, stats)
             if v < bestValue:
                 bestValue = v
                 bestAction = action
+
+    if memo is not None and len(memo) > known:
+        save_table()
     return bestAction
 
-def minValue(board) -> int:
+def minValue(board, memo=None, stats=None) -> int:
+    if stats is not None:
+        stats.nodes += 1
     if terminal(board):
         return utility(board)
+    if memo is not None:
+        key = canonical(board)
+        if key in memo:
+            return memo[key]
     v = 2
     for action in actions(board):
-        v = min(v, maxValue(result(board, action)))
+        v = min(v, maxValue(result(board, action), memo, stats))
+    if memo is not None:
+        memo[key] = v
     return v
 
 
-def maxValue(board) -> int:
+def maxValue(board, memo=None, stats=None) -> int:
+    if stats is not None:
+        stats.nodes += 1
     if terminal(board):
         return utility(board)
+    if memo is not None:
+        key = canonical(board)
+        if key in memo:
+            return memo[key]
     v = -2
     for action in actions(board):
-        v = max(v, minValue(result(board, action)))
-    return v
\ No newline at end of file
+        v = max(v, minValue(result(board, action), memo, stats))
+    if memo is not None:
+        memo[key] = v
+    return v
+
+
+def alphaBetaAction(board, stats=None):
+    """
+    Returns the optimal action, searching the moves in ORDER with
+    alpha-beta pruning and stopping at the first one that wins.
+    """
+    maximizing = player(board) == X
+    bestValue = None
+    bestAction = None
+    alpha, beta = -1, 1
+    for action in orderedActions(board):
+        v = alphaBeta(result(board, action), alpha, beta, stats)
+        if bestValue is None or (v > bestValue if maximizing else v < bestValue):
+            bestValue = v
+            bestAction = action
+        if maximizing:
+            alpha = max(alpha, v)
+        else:
+            beta = min(beta, v)
+        if alpha >= beta:
+            break
+    return bestAction
+
+
+def alphaBeta(board, alpha, beta, stats=None) -> int:
+    """
+    Returns the minimax value of the board if it lies between alpha
+    and beta, otherwise a bound on the side of the window it falls.
+    Values never leave [-1, 1], so a win for the mover ends the search
+    of a position at once.
+    """
+    if stats is not None:
+        stats.nodes += 1
+    if terminal(board):
+        return utility(board)
+    if player(board) == X:
+        v = -2
+        for action in orderedActions(board):
+            v = max(v, alphaBeta(result(board, action), alpha, beta, stats))
+            if v >= beta:
+                return v
+            alpha = max(alpha, v)
+        return v
+    v = 2
+    for action in orderedActions(board):
+        v = min(v, alphaBeta(result(board, action), alpha, beta, stats))
+        if v <= alpha:
+            return v
+        beta = min(beta, v)
+    return v
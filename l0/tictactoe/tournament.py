@@ -0,0 +1,118 @@
+"""
+Headless self-play tournament between tictactoe engines.
+
+Every ordered pairing of the chosen engines plays `games` games
+across a process pool, the first engine of a pairing playing X. For
+each engine the results, moves per second of thinking time and move
+latency percentiles are reported, and the run fails if an engine that
+plays perfectly ever loses.
+
+Usage: python tournament.py [games] [processes] [engine ...]
+"""
+
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+import tictactoe as ttt
+
+# Engine name -> minimax mode; "random" picks any available move
+ENGINES = {
+    "plain": "plain",
+    "memo": "memo",
+    "alphabeta": "alphabeta",
+    "bitboard": "bitboard",
+    "book": "book",
+    "deepening": "deepening",
+    "random": None,
+}
+
+# Engines that must never lose
+OPTIMAL = {"plain", "memo", "alphabeta", "bitboard", "book", "deepening"}
+
+PERCENTILES = [50, 90, 99]
+
+
+def play(task):
+    """
+    Plays one game. Returns (x engine, o engine, winner, and for each
+    side the list of seconds taken per move).
+    """
+    engines, seed = task
+    rng = random.Random(seed)
+    latencies = {ttt.X: [], ttt.O: []}
+    board = ttt.initial_state()
+    while not ttt.terminal(board):
+        side = ttt.player(board)
+        mode = ENGINES[engines[0] if side == ttt.X else engines[1]]
+        started = time.perf_counter()
+        if mode is None:
+            move = rng.choice(sorted(ttt.actions(board)))
+        else:
+            move = ttt.minimax(board, mode)
+        latencies[side].append(time.perf_counter() - started)
+        board = ttt.result(board, move)
+    return engines[0], engines[1], ttt.winner(board), latencies[ttt.X], latencies[ttt.O]
+
+
+def percentile(seconds, p):
+    """
+    Returns the p-th percentile of a sorted list.
+    """
+    return seconds[min(len(seconds) - 1, len(seconds) * p // 100)]
+
+
+def tournament(engines, games, processes=None, seed=0):
+    """
+    Plays every ordered pairing `games` times. Returns {engine:
+    {"wins", "losses", "draws", "latencies"}}.
+    """
+    tasks = [((x, o), seed + g) for x in engines for o in engines if x != o
+             for g in range(games)]
+    records = {engine: {"wins": 0, "losses": 0, "draws": 0, "latencies": []}
+               for engine in engines}
+    with Pool(processes) as pool:
+        for x, o, winner, x_latencies, o_latencies in pool.imap_unordered(play, tasks):
+            records[x]["latencies"].extend(x_latencies)
+            records[o]["latencies"].extend(o_latencies)
+            if winner is None:
+                records[x]["draws"] += 1
+                records[o]["draws"] += 1
+            else:
+                won, lost = (x, o) if winner == ttt.X else (o, x)
+                records[won]["wins"] += 1
+                records[lost]["losses"] += 1
+    return records
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    engines = sys.argv[3:] or list(ENGINES)
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown or len(engines) < 2:
+        sys.exit(f"Usage: python tournament.py [games] [processes] [engine ...]\n"
+                 f"Engines: {', '.join(ENGINES)} (at least two)")
+
+    started = time.perf_counter()
+    records = tournament(engines, games, processes)
+    print(f"{games} games per pairing in {time.perf_counter() - started:.1f}s")
+    print(f"{'engine':<11}{'wins':>6}{'losses':>8}{'draws':>7}{'moves':>8}{'moves/s':>11}"
+          + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES) + f"{'max ms':>10}")
+    for engine in engines:
+        record = records[engine]
+        seconds = sorted(record["latencies"])
+        rate = len(seconds) / sum(seconds) if sum(seconds) else float("inf")
+        print(f"{engine:<11}{record['wins']:>6}{record['losses']:>8}{record['draws']:>7}"
+              f"{len(seconds):>8}{rate:>11.1f}"
+              + "".join(f"{1000 * percentile(seconds, p):>10.3f}" for p in PERCENTILES)
+              + f"{1000 * seconds[-1]:>10.3f}")
+
+    losers = [engine for engine in engines if engine in OPTIMAL and records[engine]["losses"]]
+    if losers:
+        sys.exit(f"Optimal engines lost games: {', '.join(losers)}")
+
+
+if __name__ == "__main__":
+    main()